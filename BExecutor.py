@@ -0,0 +1,97 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class BatchingExecutor:
+    """
+    Micro-batching: kumpulkan prompt dari banyak pemanggil selama paling lama
+    max_wait_ms atau sampai max_batch_size item, panggil batch_fn sekali, lalu
+    kembalikan hasil ke masing-masing pemanggil lewat Future.
+    """
+    _STOP = object()
+
+    def __init__(self, batch_fn, max_batch_size=8, max_wait_ms=10):
+        self.batch_fn = batch_fn  # list[prompt] -> list[hasil], urutan sama
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.counters = {'batches': 0, 'items': 0, 'errors': 0}
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()  # submit() vs close(): tidak ada item di belakang _STOP
+        self._worker = threading.Thread(target=self._run, name="batching-executor", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt):
+        """Antrekan satu prompt; hasil tersedia di Future yang dikembalikan"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingExecutor is closed")
+            self._queue.put((prompt, future))
+        return future
+
+    def __call__(self, prompt):
+        return self.submit(prompt).result()
+
+    async def asubmit(self, prompt):
+        """Versi async: menunggu hasil tanpa memblokir event loop"""
+        return await asyncio.wrap_future(self.submit(prompt))
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                self._queue.put(item)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            batch = [entry for entry in self._collect(item)
+                     if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            self.counters['batches'] += 1
+            self.counters['items'] += len(batch)
+            try:
+                results = list(self.batch_fn([prompt for prompt, _ in batch]))
+                if len(results) != len(batch):
+                    raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} prompts")
+            except Exception as error:
+                self.counters['errors'] += 1
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        batches = self.counters['batches']
+        return {
+            **self.counters,
+            'mean_batch_size': self.counters['items'] / batches if batches else 0.0,
+            'queued': self._queue.qsize()
+        }
+
+    def close(self):
+        """Hentikan worker setelah antrean saat ini selesai diproses"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(self._STOP)
+        self._worker.join()
@@ -0,0 +1,175 @@
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from CPipeline import Pipeline
+from ECalculator import EntropyCalculator
+from HMemory import PFTCognitiveMemory
+from LMetrics import get_metrics
+
+# =============================================
+# 🧩 PROCESS POOL HELPERS
+# =============================================
+def _init_worker(config):
+    EntropyCalculator.configure_lexicons(config)
+
+def analyze_texts(texts):
+    """Tahap analisis (dijalankan di process pool): fitur teks per chunk"""
+    with get_metrics().span('analyze_batch'):  # Hanya terekam bila berjalan di proses utama
+        features = EntropyCalculator.analyze_batch(texts)
+    return {name: values.tolist() for name, values in features.items()}
+
+# =============================================
+# 🏭 BATCH RUNNER
+# =============================================
+class BatchRunner:
+    """
+    Memproses korpus prompt JSONL secara streaming:
+    analisis (process pool) -> generasi (thread pool terbatas) -> post-analisis,
+    dengan output ditulis bertahap sesuai urutan input.
+    """
+
+    def __init__(self, config, model_generator, workers=None, chunk_size=256,
+                 concurrency=8, temperature=0.65, window_size=5, seed=None):
+        self.config = config
+        self.model_generator = model_generator
+        self.workers = workers          # 0 = analisis di proses utama
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency  # Maks. generasi paralel (dan tertunda)
+        self.pipeline = Pipeline(
+            config, model_generator,
+            temperature=temperature,
+            window_size=window_size,
+            seed=seed  # None = RNG global; int = role/dimensi dapat direproduksi
+        )
+        self.counters = {'records': 0, 'errors': 0}
+
+    @staticmethod
+    def read_records(stream):
+        """
+        Baca record JSONL satu per satu; prompt di field prompt/text/input.
+        Baris yang tidak valid tidak menghentikan batch: record-nya membawa
+        field `error` (prompt kosong) dan ditulis sebagai {"id", "error"}.
+        """
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield {"id": line_number, "prompt": "", "error": f"JSON tidak valid: {error}"}
+                continue
+            if isinstance(record, str):
+                record = {"prompt": record}
+            if not isinstance(record, dict):
+                yield {"id": line_number, "prompt": "", "error": "Record harus berupa objek JSON atau string"}
+                continue
+            record.setdefault("id", line_number)
+            prompt = record.get("prompt", record.get("text", record.get("input", "")))
+            if isinstance(prompt, (int, float)) and not isinstance(prompt, bool):
+                prompt = str(prompt)
+            if not isinstance(prompt, str):
+                record["prompt"] = ""
+                record["error"] = f"Prompt harus berupa string, bukan {type(prompt).__name__}"
+            else:
+                record["prompt"] = prompt
+            yield record
+
+    @staticmethod
+    def _analyzable(record):
+        """Record yang ikut analisis dan fusi: valid dan prompt-nya tidak kosong"""
+        return 'error' not in record and bool(record['prompt'].strip())
+
+    def run(self, in_stream, out_stream):
+        started = time.time()
+        records = self.read_records(in_stream)
+        chunks = iter(lambda: list(islice(records, self.chunk_size)), [])
+
+        analysis_pool = None
+        if self.workers != 0:
+            analysis_pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+        max_chunks = ((self.workers or os.cpu_count() or 1) if analysis_pool else 1) + 1
+        pending_chunks = deque()
+        pending_outputs = deque()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as generation_pool:
+            def dispatch(chunk, analysis):
+                # Hanya record valid yang menggeser window fusi; sisanya tanpa summary
+                summaries = iter(self.pipeline.summarize_many(analysis))
+                for record in chunk:
+                    summary = next(summaries) if self._analyzable(record) else None
+                    # Antrean output terbatas -> memori tetap datar
+                    while len(pending_outputs) >= 2 * self.concurrency:
+                        self._write(out_stream, pending_outputs.popleft().result())
+                    pending_outputs.append(generation_pool.submit(self._generate, record, summary))
+
+            try:
+                for chunk in chunks:
+                    texts = [record["prompt"] for record in chunk if self._analyzable(record)]
+                    if analysis_pool is None:
+                        dispatch(chunk, analyze_texts(texts))
+                        continue
+                    pending_chunks.append((chunk, analysis_pool.submit(analyze_texts, texts)))
+                    if len(pending_chunks) >= max_chunks:
+                        chunk, future = pending_chunks.popleft()
+                        dispatch(chunk, future.result())
+
+                while pending_chunks:
+                    chunk, future = pending_chunks.popleft()
+                    dispatch(chunk, future.result())
+                while pending_outputs:
+                    self._write(out_stream, pending_outputs.popleft().result())
+            finally:
+                if analysis_pool is not None:
+                    analysis_pool.shutdown()
+
+        elapsed = time.time() - started
+        return {
+            **self.counters,
+            'elapsed': elapsed,
+            'records_per_second': self.counters['records'] / elapsed if elapsed else 0.0
+        }
+
+    def _generate(self, record, summary):
+        """Tahap generasi + post-analisis untuk satu record (thread pool)"""
+        if 'error' in record:
+            return {'id': record['id'], 'error': record['error']}
+        if summary is None:
+            return {'id': record['id'], 'prompt': record['prompt'], 'error': "Input tidak boleh kosong"}
+        result = {'id': record['id'], 'prompt': record['prompt'], 'analysis': summary}
+        try:
+            # Memori per record: hasil tidak bergantung pada urutan selesai thread
+            result['output'], output_entropy = self.pipeline.generate(
+                record['prompt'], summary,
+                memory=PFTCognitiveMemory(self.pipeline.encoder)
+            )
+            result['post_analysis'] = {'output_entropy': output_entropy}
+        except Exception as error:
+            result['error'] = str(error)
+        return result
+
+    def _write(self, out_stream, result):
+        self.counters['records'] += 1
+        if 'error' in result:
+            self.counters['errors'] += 1
+        out_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+def run_batch(in_path, out_path, config, model_generator, **options):
+    """Jalankan BatchRunner dari file JSONL ke file JSONL ('-' = stdin/stdout)"""
+    in_stream = sys.stdin if in_path == "-" else open(in_path, encoding="utf-8")
+    out_stream = sys.stdout if out_path == "-" else open(out_path, "w", encoding="utf-8")
+    try:
+        return BatchRunner(config, model_generator, **options).run(in_stream, out_stream)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
@@ -0,0 +1,774 @@
+import heapq
+import json
+import os
+import shutil
+import zlib
+from collections.abc import ItemsView, MutableMapping
+from typing import Any, Dict, Iterator, List, Tuple
+import numpy as np
+from MProof import FactCommitment, MerkleTree
+from OEngine import LogicOperator, LogicRule, OPlusReasoningEngine
+from RTrace import TraceBuffer, TraceEvent
+
+# =============================================
+# 🗜️ COMPACT KNOWLEDGE BASE
+# =============================================
+_OPERATORS = list(LogicOperator)
+SNAPSHOT_FORMAT = "⊕Mind_snapshot_v1"
+
+def _grow(array: np.ndarray, size: int, fill: Any = 0) -> np.ndarray:
+    """Return `array` with room for at least `size` entries (amortized doubling)"""
+    if size <= len(array):
+        return array
+    grown = np.full(max(size, 2 * len(array), 16), fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+def _section(arrays: Dict[str, np.ndarray], prefix: str) -> Dict[str, np.ndarray]:
+    """Entries of a flat "prefix.key" array dict, keyed by key"""
+    prefix += "."
+    return {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
+
+class SymbolTable:
+    """
+    Interns names to dense integer ids (0, 1, 2, ... in first-seen order).
+    Names are kept UTF-8 encoded in one bytearray with start offsets and found
+    through an open-addressing table of crc32 hashes, so a symbol costs a few
+    dozen bytes instead of a str object plus a dict entry.
+    """
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.starts = np.zeros(1, dtype=np.int64)  # Name i is blob[starts[i]:starts[i + 1]]
+        self.hashes = np.zeros(0, dtype=np.uint32)
+        self.slots = np.full(16, -1, dtype=np.int32)  # Probe table (size power of 2), -1 = empty
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, name: object) -> bool:
+        return self.lookup(name) >= 0
+
+    def _find(self, encoded: bytes, digest: int) -> Tuple[int, int]:
+        """(id or -1, slot where probing stopped)"""
+        mask = len(self.slots) - 1
+        slot = digest & mask
+        while True:
+            symbol = int(self.slots[slot])
+            if symbol < 0:
+                return -1, slot
+            if self.hashes[symbol] == digest and self.blob[self.starts[symbol]:self.starts[symbol + 1]] == encoded:
+                return symbol, slot
+            slot = (slot + 1) & mask
+
+    def lookup(self, name: object) -> int:
+        """Id of a name, or -1 if it was never interned"""
+        if not isinstance(name, str):
+            return -1
+        encoded = name.encode()
+        return self._find(encoded, zlib.crc32(encoded))[0]
+
+    def intern(self, name: str) -> int:
+        encoded = name.encode()
+        digest = zlib.crc32(encoded)
+        symbol, slot = self._find(encoded, digest)
+        if symbol >= 0:
+            return symbol
+        symbol = self.count
+        self.blob += encoded
+        self.starts = _grow(self.starts, symbol + 2)
+        self.starts[symbol + 1] = len(self.blob)
+        self.hashes = _grow(self.hashes, symbol + 1)
+        self.hashes[symbol] = digest
+        self.slots[slot] = symbol
+        self.count += 1
+        if 2 * self.count > len(self.slots):
+            self._rehash(2 * len(self.slots))
+        return symbol
+
+    def intern_many(self, names: List[str]) -> np.ndarray:
+        """
+        intern() for a batch, probing for all names at once; new names get ids
+        in first-seen order, exactly as interning them one by one would.
+        """
+        first_seen = {}
+        inverse = [first_seen.setdefault(name, len(first_seen)) for name in names]
+        encoded = [name.encode() for name in first_seen]
+        digests = np.fromiter(map(zlib.crc32, encoded), dtype=np.uint32, count=len(encoded))
+        ids = self._lookup_many(encoded, digests)
+
+        new = np.flatnonzero(ids < 0)
+        if len(new):
+            added = [encoded[index] for index in new.tolist()]
+            symbols = np.arange(self.count, self.count + len(new), dtype=np.int64)
+            self.starts = _grow(self.starts, self.count + len(new) + 1)
+            self.starts[self.count + 1:self.count + len(new) + 1] = (
+                len(self.blob) + np.cumsum(np.fromiter(map(len, added), dtype=np.int64, count=len(added))))
+            self.blob += b"".join(added)
+            self.hashes = _grow(self.hashes, self.count + len(new))
+            self.hashes[symbols] = digests[new]
+            self.count += len(new)
+            ids[new] = symbols
+            size = len(self.slots)
+            while 2 * self.count > size:
+                size *= 2
+            if size > len(self.slots):
+                self._rehash(size)
+            else:
+                self._place(symbols)
+        return ids[inverse] if inverse else np.zeros(0, dtype=np.int64)
+
+    def _lookup_many(self, encoded: List[bytes], digests: np.ndarray) -> np.ndarray:
+        """lookup() for a batch of distinct encoded names, one round per probe distance"""
+        found = np.full(len(encoded), -1, dtype=np.int64)
+        pending = np.arange(len(encoded), dtype=np.int64)
+        mask = len(self.slots) - 1
+        positions = digests.astype(np.int64) & mask
+        while len(pending):
+            candidates = self.slots[positions].astype(np.int64)
+            occupied = candidates >= 0
+            matches = np.flatnonzero(occupied)
+            matches = matches[self.hashes[candidates[matches]] == digests[pending[matches]]]
+            # Same crc32 is not enough: compare the bytes
+            matches = matches[self._same_bytes(candidates[matches],
+                                               [encoded[index] for index in pending[matches].tolist()])]
+            found[pending[matches]] = candidates[matches]
+            confirmed = np.zeros(len(pending), dtype=bool)
+            confirmed[matches] = True
+            keep = occupied & ~confirmed  # Empty slot: not interned; confirmed: found
+            pending, positions = pending[keep], (positions[keep] + 1) & mask
+        return found
+
+    def _same_bytes(self, symbols: np.ndarray, encoded: List[bytes]) -> np.ndarray:
+        """Per pair: is the stored name of symbols[i] equal to encoded[i]?"""
+        starts = self.starts[symbols]
+        lengths = self.starts[symbols + 1] - starts
+        same = lengths == np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        compared = np.flatnonzero(same & (lengths > 0))
+        if len(compared):
+            sizes = lengths[compared]
+            segments = np.cumsum(sizes) - sizes
+            positions = np.repeat(starts[compared] - segments, sizes) + np.arange(int(sizes.sum()))
+            stored = np.frombuffer(self.blob, dtype=np.uint8)[positions]
+            given = np.frombuffer(b"".join([encoded[index] for index in compared.tolist()]), dtype=np.uint8)
+            same[compared[np.add.reduceat(stored != given, segments) > 0]] = False
+        return same
+
+    def name(self, symbol: int) -> str:
+        return self.blob[self.starts.item(symbol):self.starts.item(symbol + 1)].decode()
+
+    def _rehash(self, size: int):
+        self.slots = np.full(size, -1, dtype=np.int32)
+        self._place(np.arange(self.count, dtype=np.int64))
+
+    def _place(self, pending: np.ndarray):
+        """Insert ids into the probe table; vectorized, one round per probe distance"""
+        mask = len(self.slots) - 1
+        home = self.hashes[pending].astype(np.int64)
+        probe = 0
+        while len(pending):
+            targets = (home + probe) & mask
+            free = np.flatnonzero(self.slots[targets] < 0)
+            # One winner per free slot; the rest retry at the next distance
+            claimed, first = np.unique(targets[free], return_index=True)
+            self.slots[claimed] = pending[free[first]]
+            placed = np.zeros(len(pending), dtype=bool)
+            placed[free[first]] = True
+            pending, home = pending[~placed], home[~placed]
+            probe += 1
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """State as arrays trimmed to the used size (see CompactReasoningEngine.snapshot)"""
+        return {
+            "blob": np.frombuffer(bytes(self.blob), dtype=np.uint8),
+            "starts": self.starts[:self.count + 1],
+            "hashes": self.hashes[:self.count],
+            "slots": self.slots
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "SymbolTable":
+        """Inverse of arrays(); adopts the arrays as they are (no per-name work)"""
+        table = cls()
+        table.blob = bytearray(arrays["blob"])  # Copied: intern() appends to it
+        table.starts, table.hashes, table.slots = arrays["starts"], arrays["hashes"], arrays["slots"]
+        table.count = len(table.hashes)
+        return table
+
+class FactBitset(MutableMapping):
+    """
+    Dict-like fact store over a SymbolTable. Truth values live in two NumPy
+    bool arrays indexed by symbol id (present, values); an id array keeps the
+    insertion order so iteration matches a plain dict. With committed=True a
+    FactCommitment follows every write, the position of a fact being its
+    index in that order.
+    """
+
+    def __init__(self, symbols: SymbolTable, committed: bool = False):
+        self.symbols = symbols
+        self.committed = committed
+        self.clear()
+
+    def clear(self):
+        self.present = np.zeros(0, dtype=bool)
+        self.values = np.zeros(0, dtype=bool)  # False wherever present is False
+        self._order = np.zeros(0, dtype=np.int32)  # Ids in insertion order
+        self._slot = np.zeros(0, dtype=np.int32)  # Id -> position in _order
+        self._size = 0
+        self.commitment = FactCommitment() if self.committed else None
+
+    def _id(self, fact: str) -> int:
+        symbol = self.symbols.lookup(fact)
+        if 0 <= symbol < len(self.present) and self.present[symbol]:
+            return symbol
+        return -1
+
+    def __getitem__(self, fact: str) -> bool:
+        symbol = self._id(fact)
+        if symbol < 0:
+            raise KeyError(fact)
+        return bool(self.values[symbol])
+
+    def __contains__(self, fact: object) -> bool:
+        return self._id(fact) >= 0
+
+    def __setitem__(self, fact: str, value: bool):
+        self.set_id(self.symbols.intern(fact), value)
+
+    def _reserve(self, size: int):
+        self.present = _grow(self.present, size)
+        self.values = _grow(self.values, size)
+        self._slot = _grow(self._slot, size, -1)
+
+    def set_id(self, symbol: int, value: bool = True):
+        if symbol >= len(self.present):
+            self._reserve(symbol + 1)
+        if not self.present[symbol]:
+            self._order = _grow(self._order, self._size + 1, -1)
+            self._order[self._size] = symbol
+            self._slot[symbol] = self._size
+            self._size += 1
+            self.present[symbol] = True
+        self.values[symbol] = bool(value)
+        if self.commitment is not None:
+            self.commitment.set(self._slot.item(symbol), self.symbols.name(symbol), value)
+
+    def set_many(self, symbols: List[int], value: bool = True):
+        """set_id for many ids at once; the first occurrence sets the insertion order"""
+        symbols = np.asarray(symbols, dtype=np.int64)
+        if not len(symbols):
+            return
+        if self.commitment is not None:
+            for symbol in dict.fromkeys(symbols.tolist()):
+                self.set_id(symbol, value)
+            return
+        self._reserve(int(symbols.max()) + 1)
+        unique, first = np.unique(symbols, return_index=True)
+        new = ~self.present[unique]
+        added = unique[new][np.argsort(first[new], kind='stable')]
+        self._order = _grow(self._order, self._size + len(added), -1)
+        self._order[self._size:self._size + len(added)] = added
+        self._slot[added] = np.arange(self._size, self._size + len(added))
+        self._size += len(added)
+        self.present[unique] = True
+        self.values[unique] = bool(value)
+
+    def __delitem__(self, fact: str):
+        symbol = self._id(fact)
+        if symbol < 0:
+            raise KeyError(fact)
+        self.present[symbol] = self.values[symbol] = False
+        # Close the gap so positions stay dense (removal is the rare case)
+        position = self._slot.item(symbol)
+        remaining = self._order[position + 1:self._size].copy()
+        self._order[position:self._size - 1] = remaining
+        self._slot[remaining] = np.arange(position, self._size - 1)
+        self._slot[symbol] = -1
+        self._size -= 1
+        if self.commitment is not None:
+            self.commitment.invalidate()
+
+    def __iter__(self) -> Iterator[str]:
+        for symbol in self._order[:self._size].tolist():
+            yield self.symbols.name(symbol)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self) -> ItemsView:
+        return _FactItems(self)
+
+    def masks(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(present, values) padded or cut to `size` symbols"""
+        present = np.zeros(size, dtype=bool)
+        values = np.zeros(size, dtype=bool)
+        count = min(size, len(self.present))
+        present[:count] = self.present[:count]
+        values[:count] = self.values[:count]
+        return present, values
+
+    def merkle_tree(self) -> MerkleTree:
+        if self.commitment is None:
+            raise ValueError("FactBitset was created without committed=True")
+        return self.commitment.refresh(self.items())
+
+    def position(self, fact: str) -> int:
+        """Leaf index of a fact (its insertion position)"""
+        symbol = self._id(fact)
+        if symbol < 0:
+            raise KeyError(fact)
+        return self._slot.item(symbol)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """State as arrays; a committed store adds its Merkle levels, flushed"""
+        arrays = {"present": self.present, "values": self.values,
+                  "order": self._order[:self._size], "slot": self._slot}
+        if self.commitment is not None:
+            tree = self.merkle_tree()
+            tree.root()
+            arrays["tree"] = np.frombuffer(b"".join(tree.levels), dtype=np.uint8)
+            arrays["tree_levels"] = np.array([len(level) for level in tree.levels], dtype=np.int64)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, symbols: SymbolTable, arrays: Dict[str, np.ndarray],
+                    committed: bool = False) -> "FactBitset":
+        facts = cls(symbols, committed)
+        facts.present, facts.values = arrays["present"], arrays["values"]
+        facts._order, facts._slot = arrays["order"], arrays["slot"]
+        facts._size = len(facts._order)
+        if committed:
+            if "tree" in arrays:
+                nodes, levels = arrays["tree"], np.cumsum(arrays["tree_levels"]).tolist()
+                facts.commitment.tree.levels = [bytearray(nodes[start:end])
+                                                for start, end in zip([0, *levels], levels)]
+            else:
+                facts.commitment.invalidate()  # Rebuilt from the facts on the next root
+        return facts
+
+class _FactItems(ItemsView):
+    """Items view that reads values by id instead of looking every name up again"""
+
+    def __iter__(self) -> Iterator[Tuple[str, bool]]:
+        facts = self._mapping
+        for symbol in facts._order[:facts._size].tolist():
+            yield facts.symbols.name(symbol), facts.values.item(symbol)
+
+class CompactRuleTable(MutableMapping):
+    """
+    Dict-like rule store in CSR form: the condition ids of row r are
+    conditions[offsets[r]:offsets[r + 1]], and conclusion, confidence, operator
+    and tags are per-row arrays. Rule names get their own SymbolTable; fact
+    names share the engine's. Reading a rule materializes a LogicRule copy, so
+    change rules through add_rule rather than by mutating the returned object.
+    A replaced rule keeps its position; its old row is left unused. As in a
+    dict, a removed rule that is added again moves to the end: rank holds the
+    position of each name in insertion order, issued afresh on every re-add.
+    """
+
+    def __init__(self, symbols: SymbolTable):
+        self.symbols = symbols
+        self.names = SymbolTable()
+        self.row_of = np.zeros(0, dtype=np.int32)  # Name id -> current row, -1 = removed
+        self.row_name = np.zeros(0, dtype=np.int32)
+        self.rank = np.zeros(0, dtype=np.int64)  # Name id -> insertion position (firing order)
+        self.ranked = np.zeros(0, dtype=np.int32)  # Insertion position -> name id
+        self.ranks = 0
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.conditions = np.zeros(0, dtype=np.int32)
+        self.conclusions = np.zeros(0, dtype=np.int32)
+        self.confidences = np.zeros(0, dtype=np.float64)
+        self.operators = np.zeros(0, dtype=np.uint8)
+        self.distinct = np.zeros(0, dtype=np.int32)  # Distinct conditions per row
+        self.tag_ids = np.zeros(0, dtype=np.int32)
+        self.tag_sets: List[Tuple[str, ...]] = [()]  # Interned tag tuples, 0 = no tags
+        self._tag_ids: Dict[Tuple[str, ...], int] = {(): 0}
+        self.rows = 0
+        self.version = 0
+        self._size = 0
+        self._index = None
+
+    def _row(self, name: object) -> int:
+        name_id = self.names.lookup(name)
+        return int(self.row_of[name_id]) if name_id >= 0 else -1
+
+    def __getitem__(self, name: str) -> LogicRule:
+        row = self._row(name)
+        if row < 0:
+            raise KeyError(name)
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return LogicRule(
+            name=name,
+            conditions=[self.symbols.name(condition) for condition in self.conditions[start:end].tolist()],
+            conclusion=self.symbols.name(self.conclusions[row]),
+            operator=_OPERATORS[self.operators[row]],
+            confidence=float(self.confidences[row]),
+            tags=list(self.tag_sets[self.tag_ids[row]])
+        )
+
+    def __contains__(self, name: object) -> bool:
+        return self._row(name) >= 0
+
+    def _tag_id(self, tags: List[str]) -> int:
+        tags = tuple(tags)
+        tag_id = self._tag_ids.get(tags)
+        if tag_id is None:
+            tag_id = self._tag_ids[tags] = len(self.tag_sets)
+            self.tag_sets.append(tags)
+        return tag_id
+
+    def __setitem__(self, name: str, rule: LogicRule):
+        condition_ids = [self.symbols.intern(condition) for condition in rule.conditions]
+        tag_id = self._tag_id(rule.tags)
+
+        name_id = self.names.intern(name)
+        row = self.rows
+        start = int(self.offsets[row])
+        end = start + len(condition_ids)
+        self.offsets = _grow(self.offsets, row + 2)
+        self.conditions = _grow(self.conditions, end)
+        for attribute in ('row_name', 'conclusions', 'confidences', 'operators', 'distinct', 'tag_ids'):
+            setattr(self, attribute, _grow(getattr(self, attribute), row + 1))
+        self.row_of = _grow(self.row_of, name_id + 1, -1)
+
+        self.conditions[start:end] = condition_ids
+        self.offsets[row + 1] = end
+        self.row_name[row] = name_id
+        self.conclusions[row] = self.symbols.intern(rule.conclusion)
+        self.confidences[row] = rule.confidence
+        self.operators[row] = _OPERATORS.index(rule.operator)
+        self.distinct[row] = len(set(condition_ids))
+        self.tag_ids[row] = tag_id
+        if self.row_of[name_id] < 0:
+            self._size += 1
+            self._rank(np.array([name_id]))
+        self.row_of[name_id] = row
+        self.rows += 1
+        self.version += 1
+
+    def extend(self, rules: List[LogicRule]) -> int:
+        """
+        Append many rules in one pass (same result as assigning them one by
+        one, later duplicates winning). Returns how many existing rules were
+        replaced.
+        """
+        count = len(rules)
+        if not count:
+            return 0
+        name_ids = self.names.intern_many([rule.name for rule in rules])
+        # Conditions then conclusion per rule: the same id order as assigning one by one
+        lengths = np.fromiter((len(rule.conditions) for rule in rules), dtype=np.int64, count=count)
+        ids = self.symbols.intern_many([symbol for rule in rules for symbol in (*rule.conditions, rule.conclusion)])
+        ends = np.cumsum(lengths + 1)
+        is_condition = np.ones(len(ids), dtype=bool)
+        is_condition[ends - 1] = False
+
+        row = self.rows
+        start = int(self.offsets[row])
+        end = start + int(lengths.sum())
+        self.offsets = _grow(self.offsets, row + count + 1)
+        self.conditions = _grow(self.conditions, end)
+        for attribute in ('row_name', 'conclusions', 'confidences', 'operators', 'distinct', 'tag_ids'):
+            setattr(self, attribute, _grow(getattr(self, attribute), row + count))
+        self.row_of = _grow(self.row_of, int(name_ids.max()) + 1, -1)
+
+        self.conditions[start:end] = ids[is_condition]
+        self.offsets[row + 1:row + count + 1] = start + np.cumsum(lengths)
+        rows = slice(row, row + count)
+        self.row_name[rows] = name_ids
+        self.conclusions[rows] = ids[ends - 1]
+        self.confidences[rows] = [rule.confidence for rule in rules]
+        self.operators[rows] = [_OPERATORS.index(rule.operator) for rule in rules]
+        self.distinct[rows] = [len(set(rule.conditions)) for rule in rules]
+        self.tag_ids[rows] = [self._tag_id(rule.tags) for rule in rules]
+
+        # New names take positions in order of first occurrence
+        unique, first = np.unique(name_ids, return_index=True)
+        new = self.row_of[unique] < 0
+        self._rank(unique[new][np.argsort(first[new], kind='stable')])
+        # Last occurrence of each name wins, as with repeated assignment
+        unique, from_end = np.unique(name_ids[::-1], return_index=True)
+        replaced = int(np.count_nonzero(~new))
+        self.row_of[unique] = row + count - 1 - from_end
+        self._size += len(unique) - replaced
+        self.rows += count
+        self.version += 1
+        return replaced
+
+    def _rank(self, name_ids: np.ndarray):
+        """Give names that are becoming live the next positions in insertion order"""
+        count = len(name_ids)
+        self.rank = _grow(self.rank, int(name_ids.max(initial=-1)) + 1, -1)
+        self.ranked = _grow(self.ranked, self.ranks + count, -1)
+        self.rank[name_ids] = np.arange(self.ranks, self.ranks + count)
+        self.ranked[self.ranks:self.ranks + count] = name_ids
+        self.ranks += count
+
+    def __delitem__(self, name: str):
+        row = self._row(name)
+        if row < 0:
+            raise KeyError(name)
+        self.row_of[self.names.lookup(name)] = -1
+        self._size -= 1
+        self.version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        for name_id in self.ranked[self.order()].tolist():
+            yield self.names.name(name_id)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def condition_counts(self) -> np.ndarray:
+        """Number of conditions (with repeats) per row"""
+        return np.diff(self.offsets[:self.rows + 1])
+
+    def order(self) -> np.ndarray:
+        """Positions (into ranked) of the live rules, in insertion order"""
+        name_ids = self.ranked[:self.ranks]
+        positions = np.arange(self.ranks)
+        # A position is stale once its rule was removed or re-added at a later one
+        return positions[(self.row_of[name_ids] >= 0) & (self.rank[name_ids] == positions)]
+
+    def live(self) -> np.ndarray:
+        """Bool per row: the row is the current version of a rule"""
+        rows = np.arange(self.rows)
+        return self.row_of[self.row_name[:self.rows]] == rows
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """State as arrays trimmed to the used rows; tag_sets are saved separately"""
+        rows = self.rows
+        arrays = {"names." + key: array for key, array in self.names.arrays().items()}
+        arrays.update({
+            "row_of": self.row_of[:len(self.names)],
+            "rank": self.rank[:len(self.names)],
+            "ranked": self.ranked[:self.ranks],
+            "offsets": self.offsets[:rows + 1],
+            "conditions": self.conditions[:int(self.offsets[rows])]
+        })
+        for attribute in ('row_name', 'conclusions', 'confidences', 'operators', 'distinct', 'tag_ids'):
+            arrays[attribute] = getattr(self, attribute)[:rows]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, symbols: SymbolTable, arrays: Dict[str, np.ndarray],
+                    tag_sets: List[List[str]]) -> "CompactRuleTable":
+        table = cls(symbols)
+        table.names = SymbolTable.from_arrays(_section(arrays, "names"))
+        for attribute in ('row_of', 'row_name', 'offsets', 'conditions', 'conclusions',
+                          'confidences', 'operators', 'distinct', 'tag_ids'):
+            setattr(table, attribute, arrays[attribute])
+        table.tag_sets = [tuple(tags) for tags in tag_sets]
+        table._tag_ids = {tags: tag_id for tag_id, tags in enumerate(table.tag_sets)}
+        if "rank" in arrays:
+            table.rank, table.ranked = arrays["rank"], arrays["ranked"]
+        else:  # Written before ranks were saved: insertion order was the name id
+            table.rank = np.arange(len(table.row_of), dtype=np.int64)
+            table.ranked = np.arange(len(table.row_of), dtype=np.int32)
+        table.ranks = len(table.ranked)
+        table.rows = len(table.row_name)
+        table._size = int(np.count_nonzero(table.row_of >= 0))
+        return table
+
+    def inverted_index(self, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Condition -> rule index over live rows, cached until the table changes:
+        (offsets, rows, counts, conditions) where the rows waiting on symbol s are
+        rows[offsets[s]:offsets[s + 1]], counts holds how often s appears in each
+        and conditions is the symbol of every entry.
+        """
+        if self._index is not None and self._index[0] == (self.version, size):
+            return self._index[1]
+        counts = self.condition_counts()
+        row_ids = np.repeat(np.arange(self.rows, dtype=np.int64), counts)
+        condition_ids = self.conditions[:len(row_ids)].astype(np.int64)
+        keep = self.live()[row_ids]
+        keys, repeats = np.unique(condition_ids[keep] * max(self.rows, 1) + row_ids[keep], return_counts=True)
+        conditions, rows = np.divmod(keys, max(self.rows, 1))
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(conditions, minlength=size), out=offsets[1:])
+        index = (offsets, rows, repeats, conditions)
+        self._index = ((self.version, size), index)
+        return index
+
+class CompactReasoningEngine(OPlusReasoningEngine):
+    """
+    OPlusReasoningEngine for very large knowledge bases. Fact names are interned
+    to integer ids, facts live in FactBitset arrays and rules in a CSR
+    CompactRuleTable. rules, facts and inferred_facts keep the dict API, so
+    add_rule, add_fact, oplus_compose and export_trace work unchanged, while
+    both reasoning modes run directly on the arrays.
+    """
+
+    def __init__(self, confidence_threshold: float = 0.75, metrics: Any = None,
+                 trace_capacity: int = 10000, trace_verbosity: int = TraceBuffer.ALL):
+        super().__init__(confidence_threshold, metrics, trace_capacity, trace_verbosity)
+        self.symbols = SymbolTable()
+        self.rules = CompactRuleTable(self.symbols)
+        self.facts = FactBitset(self.symbols, committed=True)
+        self.inferred_facts = FactBitset(self.symbols)
+
+    @classmethod
+    def from_engine(cls, engine: OPlusReasoningEngine) -> "CompactReasoningEngine":
+        """Compact copy of another engine's rules and facts (the trace starts empty)"""
+        compact = cls(engine.threshold, engine.metrics, engine.trace.events.maxlen, engine.trace.verbosity)
+        compact.rules.extend(list(engine.rules.values()))
+        for fact, value in engine.facts.items():
+            compact.facts[fact] = value
+        for fact, value in engine.inferred_facts.items():
+            compact.inferred_facts[fact] = value
+        return compact
+
+    def add_rules(self, rules: List[LogicRule]) -> int:
+        """Bulk insert through CompactRuleTable.extend"""
+        rules = list(rules)
+        if self.rules.extend(rules):
+            self._compositions.clear()
+        for rule in rules:
+            self.trace.record(TraceEvent.RULE_ADDED, rule.name)
+        return len(rules)
+
+    def snapshot(self, path: str):
+        """
+        Write the knowledge base to directory `path`: one .npy file per array
+        (symbol tables, CSR rules, fact bitsets and the flushed fact Merkle
+        levels) plus meta.json. The trace and the ⊕ memo are not saved.
+        The files go to a sibling staging directory that then replaces `path`,
+        so an existing snapshot (possibly memory-mapped by restore(), even by
+        this engine) is never written over.
+        """
+        path = os.path.normpath(path)
+        if os.path.isdir(path) and os.listdir(path) and not os.path.exists(os.path.join(path, "meta.json")):
+            raise ValueError(f"Not a snapshot directory: {path}")
+        arrays = {}
+        for prefix, section in (("symbols", self.symbols), ("rules", self.rules),
+                                ("facts", self.facts), ("inferred", self.inferred_facts)):
+            arrays.update({f"{prefix}.{key}": array for key, array in section.arrays().items()})
+        meta = {
+            "format": SNAPSHOT_FORMAT,
+            "threshold": self.threshold,
+            "tag_sets": self.rules.tag_sets,
+            "arrays": sorted(arrays)
+        }
+        staging = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, name + ".npy"), array)
+            # Written last: a snapshot without meta.json is incomplete
+            with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as handle:
+                json.dump(meta, handle, ensure_ascii=False)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        # Swap in: the old directory is renamed aside before removal, so mapped
+        # files are only unlinked (existing mappings stay valid), never truncated
+        retired = f"{path}.old-{os.getpid()}"
+        if os.path.lexists(path):
+            shutil.rmtree(retired, ignore_errors=True)
+            os.replace(path, retired)
+        os.replace(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    @classmethod
+    def restore(cls, path: str, mmap: bool = True, **options) -> "CompactReasoningEngine":
+        """
+        Load a snapshot written by snapshot(). The arrays are adopted as they
+        are, with no per-rule work; with mmap=True they are memory-mapped
+        copy-on-write, so pages load on first use and later writes stay in
+        this process (the files are never modified). options go to __init__.
+        """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {meta.get('format')!r}")
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="c" if mmap else None)
+                  for name in meta["arrays"]}
+        engine = cls(meta["threshold"], **options)
+        engine.symbols = SymbolTable.from_arrays(_section(arrays, "symbols"))
+        engine.rules = CompactRuleTable.from_arrays(engine.symbols, _section(arrays, "rules"), meta["tag_sets"])
+        engine.facts = FactBitset.from_arrays(engine.symbols, _section(arrays, "facts"), committed=True)
+        engine.inferred_facts = FactBitset.from_arrays(engine.symbols, _section(arrays, "inferred"))
+        return engine
+
+    def _index_rule(self, order: int, rule: LogicRule):
+        pass  # CompactRuleTable.inverted_index replaces the dict index
+
+    def _ensure_index(self):
+        pass
+
+    def _truth(self) -> np.ndarray:
+        """Truth per symbol; inferred facts take precedence over given facts"""
+        size = len(self.symbols)
+        inferred_present, inferred_values = self.inferred_facts.masks(size)
+        return np.where(inferred_present, inferred_values, self.facts.masks(size)[1])
+
+    def _reason_sequential(self) -> Tuple[List[str], List[str]]:
+        with self._span("reason.evaluate"):
+            return self._chain(sequential=True)
+
+    def _reason_forward(self) -> Tuple[List[str], List[str]]:
+        with self._span("reason.forward"):
+            return self._chain(sequential=False)
+
+    def _chain(self, sequential: bool) -> Tuple[List[str], List[str]]:
+        """
+        Array version of both modes. Only fully satisfied rules can fire or be
+        traced, so rules go on an agenda (ordered by insertion) once their
+        missing-condition count reaches zero. Sequential mode counts repeated
+        conditions and lets a new fact satisfy only rules later in the pass;
+        forward mode counts distinct conditions and runs to fixpoint.
+        """
+        table = self.rules
+        truth = self._truth()
+        offsets, waiting_rows, repeats, pair_conditions = table.inverted_index(len(truth))
+        held = truth[pair_conditions]
+        lengths = table.condition_counts()
+        if sequential:
+            needed = lengths
+            met = np.bincount(waiting_rows[held], weights=repeats[held], minlength=table.rows)
+        else:
+            needed = table.distinct[:table.rows]
+            met = np.bincount(waiting_rows[held], minlength=table.rows)
+        missing = needed.astype(np.int64) - met.astype(np.int64)
+
+        live = table.live()
+        order = table.rank[table.row_name[:table.rows]]  # Position in insertion order per row
+        agenda = order[live & (missing == 0)].tolist()
+        heapq.heapify(agenda)
+
+        row_of, ranked = table.row_of, table.ranked
+        confidences, conclusion_ids = table.confidences, table.conclusions
+        applied_rules = []
+        fired = []  # Conclusion ids, stored into inferred_facts in one step
+        while agenda:
+            current = heapq.heappop(agenda)
+            name_id = ranked.item(current)
+            row = row_of.item(name_id)
+            count = lengths.item(row)
+            rule_name = table.names.name(name_id)
+            fires, confidence = self._check_rule(rule_name, count, confidences.item(row), count)
+            if not fires:
+                continue
+            conclusion = conclusion_ids.item(row)
+            applied_rules.append(rule_name)
+            self._commit_applied(rule_name)
+            fired.append(conclusion)
+            if truth.item(conclusion):
+                continue
+            truth[conclusion] = True
+            for entry in range(offsets.item(conclusion), offsets.item(conclusion + 1)):
+                waiting = waiting_rows.item(entry)
+                position = order.item(waiting)
+                if sequential and position < current:
+                    continue  # Already passed in this pass
+                remaining = missing.item(waiting) - (repeats.item(entry) if sequential else 1)
+                missing[waiting] = remaining
+                if remaining == 0 and live.item(waiting):
+                    heapq.heappush(agenda, position)
+
+        self.inferred_facts.set_many(fired)
+        conclusions = [self.symbols.name(conclusion) for conclusion in fired]
+        return applied_rules, conclusions
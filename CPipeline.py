@@ -0,0 +1,234 @@
+import threading
+from ECalculator import EntropyCalculator
+from HMemory import PFTCognitiveMemory
+from LMetrics import get_metrics
+from OGenerator import OutputGenerator
+from RSelector import RoleSampler, RoleSelector
+
+# =============================================
+# 🧩 SHARED ANALYSIS HELPERS
+# =============================================
+def system_note(fusion_value, collapse_risk):
+    """Instruksi tambahan untuk prompt berdasarkan nilai fusion dan risiko collapse"""
+    note = ""
+    if fusion_value > 0.4:
+        note = " [Gunakan pendekatan terstruktur dan solusi konkret]"
+    elif fusion_value < -0.4:
+        note = " [Eksplorasi berbagai perspektif dan kemungkinan solusi]"
+
+    if collapse_risk:
+        note += " ⚠️[HINDARI HALUSINASI - FAKTA SAJA]"
+    return note
+
+def collapse_risk(cognitive_depth, abstraction_level):
+    """Deteksi risiko reasoning collapse"""
+    return cognitive_depth > 0.7 and abstraction_level > 0.6
+
+def text_features(text):
+    """Fitur teks dasar untuk satu input (versi skalar dari analyze_batch)"""
+    metrics = get_metrics()
+    with metrics.span('entropy'):
+        entropy = EntropyCalculator.calculate_text_entropy(text)
+    # Kedalaman kognitif dan abstraksi dari satu pemindaian lexicon, diukur sebagai satu tahap
+    # (memindai per tahap hanya saat metrik aktif akan mengubah kerja yang diukur)
+    with metrics.span('complexity'):
+        cognitive_depth, abstraction_level = EntropyCalculator.score_complexity(text)
+    return {
+        'entropy': entropy,
+        'entropy_level': EntropyCalculator.get_entropy_level(
+            EntropyCalculator.normalize_entropy(entropy)
+        ),
+        'cognitive_depth': cognitive_depth,
+        'abstraction_level': abstraction_level
+    }
+
+def summarize_features(features, pft_controller, selector, selection=None):
+    """
+    Tahap berurutan: fusion (window historis) serta pemilihan role dan dimensi.
+    selection = (role, gaya kognitif, gaya pemrosesan) yang sudah di-sample, opsional.
+    """
+    cognitive_depth = features['cognitive_depth']
+    abstraction_level = features['abstraction_level']
+    entropy_level = features['entropy_level']
+
+    metrics = get_metrics()
+    with metrics.span('pft_fusion'):
+        fusion_value = float(pft_controller.fuse(cognitive_depth, abstraction_level))
+    with metrics.span('role_selection'):
+        role, cognitive_style, processing_style = selection or selector.select(entropy_level)
+
+    return {
+        'entropy': features['entropy'],
+        'entropy_level': entropy_level,
+        'cognitive_depth': cognitive_depth,
+        'abstraction_level': abstraction_level,
+        'fusion_value': fusion_value,
+        'collapse_risk': collapse_risk(cognitive_depth, abstraction_level),
+        'role': role,
+        'cognitive_style': cognitive_style,
+        'processing_style': processing_style
+    }
+
+# =============================================
+# 🏗️ COMPILED PIPELINE
+# =============================================
+class Pipeline:
+    """
+    Pipeline analisis -> seleksi -> generasi yang dikompilasi sekali dari config:
+    lexicon, tabel role/dimensi (bobot kumulatif), PFTFusion, memori, dan
+    OutputGenerator per kombinasi (role, gaya kognitif, gaya pemrosesan)
+    dipakai ulang untuk setiap input. Dengan seed, role/dimensi dipilih oleh
+    RoleSampler (numpy, deterministik) alih-alih RNG global.
+    """
+
+    def __init__(self, config, model_generator=None, memory=None, encoder=None,
+                 temperature=0.65, window_size=5, seed=None):
+        self.config = config
+        self.model_generator = model_generator
+        self.temperature = temperature
+        self.window_size = window_size
+
+        EntropyCalculator.configure_lexicons(config)
+        self.selector = RoleSelector(config) if seed is None else RoleSampler(config, seed)
+        self.pft_controller = self.new_fusion()
+        self.encoder = encoder
+        self.memory = memory or PFTCognitiveMemory(encoder)
+        self.generators = {}  # (role, cognitive, processing) -> OutputGenerator
+        self._lock = threading.RLock()  # STM + fusi memori bersifat berurutan
+
+    def new_fusion(self):
+        """PFTFusion baru dengan parameter pipeline (mis. untuk satu sesi)"""
+        return EntropyCalculator.PFTFusion(
+            temperature=self.temperature,
+            window_size=self.window_size
+        )
+
+    def session_selector(self, session_id):
+        """Selector untuk satu sesi: stream RoleSampler sendiri jika pipeline ber-seed"""
+        if isinstance(self.selector, RoleSampler):
+            return self.selector.stream(session_id)
+        return self.selector
+
+    # =============================================
+    # 🔬 ANALYSIS
+    # =============================================
+    def summarize(self, features, pft_controller=None, selector=None):
+        return summarize_features(
+            features,
+            pft_controller or self.pft_controller,
+            selector or self.selector
+        )
+
+    def summarize_many(self, features, pft_controller=None, selector=None):
+        """
+        Summary untuk fitur berbentuk kolom (name -> list). Dengan RoleSampler,
+        role dan dimensi seluruh baris di-sample dalam satu panggilan.
+        """
+        pft_controller = pft_controller or self.pft_controller
+        selector = selector or self.selector
+        rows = [dict(zip(features, values)) for values in zip(*features.values())]
+        if not isinstance(selector, RoleSampler):
+            return [summarize_features(row, pft_controller, selector) for row in rows]
+
+        selections = zip(*(values.tolist() for values in selector.sample(features['entropy_level'])))
+        return [
+            summarize_features(row, pft_controller, selector, selection)
+            for row, selection in zip(rows, selections)
+        ]
+
+    def analyze(self, text, pft_controller=None, selector=None):
+        """Fitur teks, fusion, dan pemilihan role/dimensi untuk satu input"""
+        return self.summarize(text_features(text), pft_controller, selector)
+
+    def analyze_many(self, texts, pft_controller=None, selector=None):
+        """Seperti analyze, dengan fitur teks dihitung vektor untuk semua input"""
+        with get_metrics().span('analyze_batch'):
+            features = {name: values.tolist() for name, values in EntropyCalculator.analyze_batch(texts).items()}
+        return self.summarize_many(features, pft_controller, selector)
+
+    # =============================================
+    # 🤖 GENERATION
+    # =============================================
+    def generator_for(self, summary, memory=None, generators=None):
+        """
+        OutputGenerator untuk kombinasi role/dimensi pada summary. Tanpa memory,
+        memakai memori dan cache pipeline; dengan memory, memakai cache generators
+        milik pemanggil (None = generator baru).
+        """
+        if memory is None:
+            memory, generators = self.memory, self.generators
+        key = (summary['role'], summary['cognitive_style'], summary['processing_style'])
+        generator = generators.get(key) if generators is not None else None
+        if generator is None:
+            generator = OutputGenerator(*key, encoder=self.encoder, memory=memory)
+            if generators is not None:
+                generators[key] = generator
+        return generator
+
+    def generate(self, text, summary, memory=None, generators=None, on_chunk=None):
+        """Hasilkan respons; kembalikan (output, entropy output)"""
+        generator = self.generator_for(summary, memory, generators)
+        input_text = text + system_note(summary['fusion_value'], summary['collapse_risk'])
+        with self._lock:
+            pending = generator.prepare_generation(input_text)
+
+        accumulator = EntropyCalculator.StreamingEntropy()
+        with get_metrics().span('model_call'):
+            response = generator.collect_response(
+                self.model_generator(pending['prompt']), on_chunk, accumulator
+            )
+        with self._lock:
+            output = generator.finalize_generation(input_text, response, pending, accumulator)
+        return output, pending['output_entropy']
+
+    async def agenerate(self, text, summary, memory=None, generators=None, on_chunk=None):
+        """Versi async dari generate untuk generator model async"""
+        generator = self.generator_for(summary, memory, generators)
+        input_text = text + system_note(summary['fusion_value'], summary['collapse_risk'])
+        with self._lock:
+            pending = generator.prepare_generation(input_text)
+
+        accumulator = EntropyCalculator.StreamingEntropy()
+        with get_metrics().span('model_call'):
+            response = self.model_generator(pending['prompt'])
+            if not hasattr(response, '__aiter__'):
+                response = await response
+            response = await generator.acollect_response(response, on_chunk, accumulator)
+        with self._lock:
+            output = generator.finalize_generation(input_text, response, pending, accumulator)
+        return output, pending['output_entropy']
+
+    # =============================================
+    # 🚀 END-TO-END
+    # =============================================
+    def process(self, text, on_chunk=None):
+        """Analisis dan generasi untuk satu input"""
+        with get_metrics().span('request'):
+            summary = self.analyze(text)
+            output, output_entropy = self.generate(text, summary, on_chunk=on_chunk)
+        return {
+            'analysis': summary,
+            'output': output,
+            'post_analysis': {'output_entropy': output_entropy}
+        }
+
+    def process_many(self, texts):
+        """
+        Analisis vektor untuk semua input, lalu generasi berurutan. Seperti
+        REPL, input kosong dilewati (tidak ikut fusi) dan hanya diberi error.
+        """
+        texts = list(texts)  # Bisa generator: dibaca dua kali
+        summaries = iter(self.analyze_many([text for text in texts if text.strip()]))
+        results = []
+        for text in texts:
+            if not text.strip():
+                results.append({'error': "Input tidak boleh kosong"})
+                continue
+            summary = next(summaries)
+            output, output_entropy = self.generate(text, summary)
+            results.append({
+                'analysis': summary,
+                'output': output,
+                'post_analysis': {'output_entropy': output_entropy}
+            })
+        return results
@@ -1,6 +1,12 @@
 import math
 import numpy as np
 from collections import Counter
+from LMatcher import LexiconMatcher
+
+# Batas atas code point Unicode, dipakai untuk membentuk kunci (teks, karakter)
+_CODEPOINT_SPACE = 0x110000
+_ENTROPY_LEVELS = np.array(["low", "medium", "high"])
+_ENTROPY_LEVEL_BINS = np.array([0.3, 0.7])
 
 class EntropyCalculator:
     @staticmethod
@@ -8,16 +14,43 @@ class EntropyCalculator:
         """Menghitung entropy Shannon untuk teks input"""
         if not text:
             return 0.0
-        
-        char_counts = Counter(text)
-        text_length = len(text)
-        entropy = 0.0
-        
-        for count in char_counts.values():
-            probability = count / text_length
-            entropy -= probability * math.log2(probability)
-        
-        return entropy
+        return float(EntropyCalculator.calculate_entropy_batch([text])[0])
+
+    @staticmethod
+    def calculate_entropy_batch(texts):
+        """
+        Entropy Shannon untuk banyak teks sekaligus.
+        Histogram karakter dihitung secara vektor atas array code point
+        gabungan, bukan dengan Counter per teks.
+        """
+        texts = list(texts)
+        n = len(texts)
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n)
+        if n == 0 or not lengths.any():
+            return np.zeros(n)
+
+        codepoints = np.frombuffer(
+            "".join(texts).encode("utf-32-le", "surrogatepass"),
+            dtype=np.uint32
+        )
+        segments = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        keys, counts = np.unique(
+            segments * _CODEPOINT_SPACE + codepoints,
+            return_counts=True
+        )
+        return EntropyCalculator._entropy_from_counts(
+            keys // _CODEPOINT_SPACE, counts, lengths
+        )
+
+    @staticmethod
+    def _entropy_from_counts(segments, counts, lengths):
+        """Jumlahkan -p*log2(p) per segmen dari histogram (segmen, jumlah)"""
+        probability = counts / lengths[segments]
+        return np.bincount(
+            segments,
+            weights=-probability * np.log2(probability),
+            minlength=len(lengths)
+        )
 
     @staticmethod
     def normalize_entropy(entropy, max_possible=8):
@@ -34,35 +67,149 @@ class EntropyCalculator:
             return "medium"
         else:
             return "high"
+
+    @staticmethod
+    def normalize_entropy_batch(entropies, max_possible=8):
+        """Versi vektor dari normalize_entropy"""
+        return np.minimum(np.asarray(entropies, dtype=float) / max_possible, 1.0)
+
+    @staticmethod
+    def get_entropy_level_batch(normalized_entropies):
+        """Versi vektor dari get_entropy_level"""
+        return _ENTROPY_LEVELS[
+            np.digitize(normalized_entropies, _ENTROPY_LEVEL_BINS)
+        ]
+
+    @staticmethod
+    def analyze_batch(texts, max_possible=8):
+        """
+        Hitung seluruh fitur teks untuk banyak input sekaligus.
+        Mengembalikan dict berisi array NumPy dengan urutan sesuai input.
+        """
+        texts = list(texts)
+        entropy = EntropyCalculator.calculate_entropy_batch(texts)
+        normalized = EntropyCalculator.normalize_entropy_batch(entropy, max_possible)
+        matcher = EntropyCalculator.get_lexicon_matcher()
+        complexity = np.array(
+            [matcher.score(t) for t in texts], dtype=float
+        ).reshape(len(texts), 2)
+        return {
+            'entropy': entropy,
+            'normalized_entropy': normalized,
+            'entropy_level': EntropyCalculator.get_entropy_level_batch(normalized),
+            'cognitive_depth': complexity[:, 0],
+            'abstraction_level': complexity[:, 1]
+        }
     
+    # =============================================
+    # 🌊 STREAMING ENTROPY
+    # =============================================
+    class StreamingEntropy:
+        """
+        Akumulator entropy inkremental untuk teks yang datang per potongan.
+        Hasil entropy() identik dengan calculate_text_entropy atas gabungan potongan.
+        """
+
+        def __init__(self, text=""):
+            self.char_counts = Counter()
+            self.length = 0
+            if text:
+                self.update(text)
+
+        def update(self, chunk):
+            """Tambahkan potongan teks baru ke histogram"""
+            self.char_counts.update(chunk)
+            self.length += len(chunk)
+            return self
+
+        def merge(self, other):
+            """Gabungkan akumulator lain (hasil potongan paralel) ke akumulator ini"""
+            self.char_counts.update(other.char_counts)
+            self.length += other.length
+            return self
+
+        def __add__(self, other):
+            return EntropyCalculator.StreamingEntropy().merge(self).merge(other)
+
+        def entropy(self):
+            """Entropy Shannon dari seluruh teks yang sudah diterima"""
+            if not self.length:
+                return 0.0
+            # Urutkan berdasarkan code point agar urutan penjumlahan sama dengan jalur batch
+            counts = np.array(
+                [count for _, count in sorted(self.char_counts.items())],
+                dtype=np.int64
+            )
+            return float(EntropyCalculator._entropy_from_counts(
+                np.zeros(len(counts), dtype=np.int64),
+                counts,
+                np.array([self.length])
+            )[0])
+
     # =============================================
     # 🔥 PFT FUSION INTEGRATION
     # =============================================
     class PFTFusion:
+        # Jumlah baris yang diproses per blok pada replay fuse_many
+        REPLAY_BLOCK = 65536
+
         def __init__(self, temperature=0.5, window_size=10):
             self.T = temperature  # Parameter kontrol "exploration vs exploitation"
-            self.entropy_window = []  # Penyimpanan histori entropy
             self.window_size = window_size  # Ukuran moving window
+            # Ring buffer histori entropy + jumlah berjalan (running sums)
+            self._buffer = np.zeros(window_size)
+            self._head = 0
+            self._count = 0
+            self._sum = 0.0       # Σ v
+            self._abs_sum = 0.0   # Σ |v|
+            self._plogp_sum = 0.0 # Σ |v| log|v|
+
+        @property
+        def entropy_window(self):
+            """Histori entropy dalam urutan kronologis (salinan, untuk dibaca)"""
+            if self._count < self.window_size:
+                return self._buffer[:self._count].tolist()
+            return np.roll(self._buffer, -self._head).tolist()
+
+        @staticmethod
+        def _xlogx(value):
+            return value * math.log(value) if value > 0 else 0.0
+
+        def _resync(self):
+            """Hitung ulang jumlah berjalan dari buffer untuk membuang drift floating point"""
+            values = self._buffer[:self._count] if self._count < self.window_size else self._buffer
+            self._sum = math.fsum(values)
+            self._abs_sum = math.fsum(abs(v) for v in values)
+            self._plogp_sum = math.fsum(self._xlogx(abs(v)) for v in values)
 
         def update_entropy(self, value):
-            """Update window dengan nilai entropy baru"""
-            self.entropy_window.append(value)
-            if len(self.entropy_window) > self.window_size:
-                self.entropy_window.pop(0)
+            """Update window dengan nilai entropy baru (O(1), tanpa alokasi array)"""
+            value = float(value)
+            if self._count == self.window_size:
+                old = self._buffer[self._head]
+                self._sum -= old
+                self._abs_sum -= abs(old)
+                self._plogp_sum -= self._xlogx(abs(old))
+            else:
+                self._count += 1
+
+            self._buffer[self._head] = value
+            self._sum += value
+            self._abs_sum += abs(value)
+            self._plogp_sum += self._xlogx(abs(value))
+
+            self._head = (self._head + 1) % self.window_size
+            if self._head == 0:
+                self._resync()  # Sekali per putaran buffer -> tetap O(1) teramortisasi
 
         def compute_window_entropy(self):
-            """Hitung entropy dari histori entropy (meta-entropy)"""
-            if len(self.entropy_window) < 2:
-                return 0
-            
-            # Normalisasi nilai absolut
-            abs_values = np.abs(self.entropy_window)
-            total = np.sum(abs_values)
-            if total == 0:
+            """
+            Hitung entropy dari histori entropy (meta-entropy).
+            Dengan p = |v| / S: H = log S - Σ|v| log|v| / S
+            """
+            if self._count < 2 or self._abs_sum <= 0:
                 return 0
-                
-            p = abs_values / total
-            return -np.sum(p * np.log(p + 1e-10))  # Shannon entropy + stabilizer
+            return max(math.log(self._abs_sum) - self._plogp_sum / self._abs_sum, 0.0)
 
         def fuse(self, a, b):
             """
@@ -73,43 +220,77 @@ class EntropyCalculator:
             meta_entropy = self.compute_window_entropy()
             F = (a - b) - self.T * meta_entropy
             return np.tanh(F)  # Normalisasi [-1, 1]
+
+        def fuse_many(self, a_values, b_values):
+            """
+            Replay satu sesi penuh secara vektor: setara dengan memanggil
+            fuse(a, b) berurutan untuk setiap pasangan, lalu window berlanjut
+            dari nilai terakhir.
+            """
+            a = np.asarray(a_values, dtype=float)
+            b = np.asarray(b_values, dtype=float)
+            if a.shape != b.shape or a.ndim != 1:
+                raise ValueError("a_values dan b_values harus array 1D dengan panjang sama")
+            if not len(a):
+                return np.empty(0)
+
+            w = self.window_size
+            history = self.entropy_window
+            history = np.asarray(history[len(history) - (w - 1):] if w > 1 else [])
+            # Padding nol tidak mengubah Σ|v| maupun Σ p log p
+            padded = np.abs(np.concatenate((np.zeros(w - 1 - len(history)), history, a)))
+            windows = np.lib.stride_tricks.sliding_window_view(padded, w)
+            counts = np.minimum(self._count + np.arange(1, len(a) + 1), w)
+
+            meta_entropy = np.zeros(len(a))
+            for start in range(0, len(a), self.REPLAY_BLOCK):
+                block = windows[start:start + self.REPLAY_BLOCK]
+                totals = block.sum(axis=1)
+                valid = (totals > 0) & (counts[start:start + self.REPLAY_BLOCK] >= 2)
+                p = block[valid] / totals[valid, None]
+                meta_entropy[start:start + len(block)][valid] = -np.sum(p * np.log(p + 1e-10), axis=1)
+
+            for value in a[-w:]:
+                self.update_entropy(value)
+
+            return np.tanh((a - b) - self.T * meta_entropy)
         
         def dynamic_threshold(self):
             """Threshold adaptif berdasarkan moving average"""
-            if len(self.entropy_window) < 3:
+            if self._count < 3:
                 return 0.5
-            return np.mean(self.entropy_window) * 0.7
+            return self._sum / self._count * 0.7
 
     # =============================================
     # 🧠 ADVANCED COMPLEXITY ESTIMATORS
     # =============================================
+    _lexicon_matcher = None
+
+    @staticmethod
+    def configure_lexicons(config):
+        """Kompilasi lexicon dari config (bagian "lexicons") menjadi satu matcher"""
+        EntropyCalculator._lexicon_matcher = LexiconMatcher.from_config(config)
+        return EntropyCalculator._lexicon_matcher
+
+    @staticmethod
+    def get_lexicon_matcher():
+        """Matcher aktif; dibangun dari lexicon bawaan bila belum dikonfigurasi"""
+        if EntropyCalculator._lexicon_matcher is None:
+            EntropyCalculator.configure_lexicons({})
+        return EntropyCalculator._lexicon_matcher
+
+    @staticmethod
+    def score_complexity(text):
+        """Hitung (cognitive_depth, abstraction_level) dalam satu kali scan teks"""
+        return EntropyCalculator.get_lexicon_matcher().score(text)
+
     @staticmethod
     def estimate_cognitive_depth(text):
         """Estimasi kedalaman kognitif teks"""
         # Heuristik: hitung density kata kunci kompleksitas
-        complexity_indicators = ["mengapa", "bagaimana", "solusi", "analisis",
-                                "perbandingan", "dampak", "strategi"]
-        words = text.lower().split()
-        
-        if not words:
-            return 0
-            
-        count = sum(1 for word in words if word in complexity_indicators)
-        return min(count / len(words), 1.0)
+        return EntropyCalculator.get_lexicon_matcher().stage_matchers()[0].score(text)[0]
     
     @staticmethod
     def detect_abstraction_level(text):
         """Deteksi level abstraksi berdasarkan indikator linguistik"""
-        abstract_indicators = ["secara umum", "prinsipnya", "pada dasarnya",
-                              "konsep", "filosofi", "paradigma"]
-        concrete_indicators = ["contoh", "langkah", "praktek", "implementasi",
-                              "teknis", "instruksi"]
-        
-        abstract_count = sum(text.lower().count(phrase) for phrase in abstract_indicators)
-        concrete_count = sum(text.lower().count(phrase) for phrase in concrete_indicators)
-        
-        total = abstract_count + concrete_count
-        if total == 0:
-            return 0.5  # Netral
-            
-        return abstract_count / total  # 0=konkret, 1=abstrak
\ No newline at end of file
+        return EntropyCalculator.get_lexicon_matcher().stage_matchers()[1].score(text)[1]  # 0=konkret, 1=abstrak
\ No newline at end of file
@@ -0,0 +1,155 @@
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+class EmbeddingProvider:
+    """Antarmuka penyedia embedding offline"""
+    dim = 100
+
+    def encode(self, texts):
+        """Embedding untuk banyak teks sekaligus, array (n, dim)"""
+        raise NotImplementedError
+
+    def embed(self, text):
+        """Embedding untuk satu teks"""
+        return self.encode([text])[0]
+
+    @staticmethod
+    def similarity(vector_A, vector_B):
+        """Cosine similarity; vektor nol dianggap tidak selaras (0.0)"""
+        norm = np.linalg.norm(vector_A) * np.linalg.norm(vector_B)
+        if norm == 0:
+            return 0.0
+        return float(np.dot(vector_A, vector_B) / norm)
+
+class HashingEmbedder(EmbeddingProvider):
+    """
+    Vectorizer hashing-trick: n-gram karakter + kata di-hash (CRC32) ke
+    dimensi tetap. Deterministik antar proses dan tidak butuh model.
+    """
+
+    def __init__(self, dim=100, char_ngrams=(3, 5), use_words=True):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.use_words = use_words
+
+    def features(self, text):
+        """Daftar fitur string (n-gram karakter dan kata) dari teks"""
+        text = text.lower()
+        if not text.strip():
+            return []
+
+        padded = f" {text} "
+        low, high = self.char_ngrams
+        features = [
+            padded[i:i + n]
+            for n in range(low, high + 1)
+            for i in range(len(padded) - n + 1)
+        ]
+        if self.use_words:
+            features.extend("w:" + word for word in re.findall(r'\w+', text))
+        return features
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim))
+        for row, text in enumerate(texts):
+            features = self.features(text)
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode("utf-8", "surrogatepass")) for f in features),
+                dtype=np.uint64, count=len(features)
+            )
+            # Bit teratas menentukan tanda untuk meredam tabrakan hash
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+            vectors[row] = np.bincount(
+                (hashes % self.dim).astype(np.int64),
+                weights=signs,
+                minlength=self.dim
+            )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+class CachedEncoder(EmbeddingProvider):
+    """
+    Pembungkus provider dengan cache LRU terbatas, dikunci oleh hash teks.
+    Aman dipakai bersama antar thread: lookup, insert, dan eviksi dijaga satu
+    lock, sedangkan provider.encode berjalan di luar lock.
+    """
+
+    def __init__(self, provider, maxsize=4096):
+        self.provider = provider
+        self.dim = provider.dim
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def text_key(text):
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def encode(self, texts):
+        texts = list(texts)
+        keys = [self.text_key(t) for t in texts]
+        result = np.empty((len(texts), self.dim))
+
+        pending = {}
+        with self._lock:
+            for row, key in enumerate(keys):
+                vector = self.cache.get(key)
+                if vector is not None:
+                    self.cache.move_to_end(key)
+                    result[row] = vector
+                    self.hits += 1
+                else:
+                    pending.setdefault(key, []).append(row)
+            self.misses += len(pending)
+
+        if pending:
+            # Di luar lock: thread lain tetap dilayani dari cache selama encode
+            fresh = self.provider.encode([texts[rows[0]] for rows in pending.values()])
+            vectors = []
+            for rows, vector in zip(pending.values(), fresh):
+                vector = vector.copy()
+                vector.flags.writeable = False
+                result[rows] = vector
+                vectors.append(vector)
+            with self._lock:
+                for key, vector in zip(pending, vectors):
+                    self.cache[key] = vector
+                    self.cache.move_to_end(key)
+                while len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self.cache),
+                'maxsize': self.maxsize
+            }
+
+# Encoder bersama: memori, evaluasi respons, dan pencarian kemiripan
+# memakai satu cache yang sama sehingga makna berulang tidak di-embed ulang
+_default_encoder = None
+_default_lock = threading.Lock()
+
+def get_default_encoder():
+    global _default_encoder
+    if _default_encoder is None:
+        with _default_lock:
+            if _default_encoder is None:
+                _default_encoder = CachedEncoder(HashingEmbedder())
+    return _default_encoder
+
+def set_default_encoder(encoder):
+    global _default_encoder
+    _default_encoder = encoder
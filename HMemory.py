@@ -1,20 +1,303 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
 from scipy.spatial.distance import cosine
+from EProvider import EmbeddingProvider, get_default_encoder
+
+def top_k(scores, k):
+    """Indeks k skor tertinggi, urut menurun; skor sama -> indeks paling awal"""
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k == 1:
+        return np.array([np.argmax(scores)])
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.lexsort((top, -scores[top]))]
+
+class EmbeddingIndex:
+    """
+    Matriks embedding kontigu yang sudah dinormalisasi, disimpan berdampingan
+    dengan LTM. Pencarian = satu perkalian matriks-vektor + seleksi top-k.
+    """
+
+    def __init__(self, dim=None, capacity=1024):
+        self.dim = dim
+        self.capacity = capacity
+        self.matrix = None
+        self.keys = []   # Baris ke-i milik keys[i]
+        self.rows = {}   # key -> baris
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def _ensure_capacity(self, vector):
+        if self.matrix is None:
+            self.dim = self.dim or len(vector)
+            self.matrix = np.zeros((self.capacity, self.dim), dtype=np.float32)
+        elif len(self.keys) == len(self.matrix):
+            grown = np.zeros((len(self.matrix) * 2, self.dim), dtype=np.float32)
+            grown[:len(self.matrix)] = self.matrix
+            self.matrix = grown
+
+    @staticmethod
+    def normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def add(self, key, vector):
+        """Tambah atau timpa embedding untuk key"""
+        row = self.rows.get(key)
+        if row is None:
+            self._ensure_capacity(vector)
+            row = len(self.keys)
+            self.rows[key] = row
+            self.keys.append(key)
+        self.matrix[row] = self.normalize(vector)
+
+    def remove(self, key):
+        """Hapus key; baris terakhir dipindah ke slot kosong agar matriks tetap kontigu"""
+        row = self.rows.pop(key)
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.matrix[row] = self.matrix[last]
+            self.keys[row] = moved
+            self.rows[moved] = row
+        self.keys.pop()
+
+    def search(self, query, k=1):
+        """Kembalikan (keys, scores) untuk k embedding paling mirip (cosine)"""
+        n = len(self.keys)
+        if not n:
+            return [], np.empty(0, dtype=np.float32)
+
+        scores = self.matrix[:n] @ self.normalize(query)
+        top = top_k(scores, min(k, n))
+        return [self.keys[i] for i in top], scores[top]
+
+# =============================================
+# 🧹 EVICTION POLICIES
+# =============================================
+class LRUEviction:
+    """Buang pengalaman yang paling lama tidak dipakai"""
 
-class PFTCognitiveMemory:
     def __init__(self):
+        self.order = OrderedDict()
+
+    def add(self, key, record):
+        self.order[key] = None
+        self.order.move_to_end(key)
+
+    def touch(self, key):
+        if key in self.order:
+            self.order.move_to_end(key)
+
+    def remove(self, key):
+        self.order.pop(key, None)
+
+    def victim(self):
+        return next(iter(self.order), None)
+
+class _HeapEviction:
+    """Basis kebijakan berbasis min-heap dengan penghapusan malas"""
+
+    def __init__(self):
+        self.heap = []
+        self.current = {}  # key -> entri heap yang masih berlaku
+        self.sequence = itertools.count()
+
+    def _push(self, key, priority):
+        entry = (priority, next(self.sequence), key)
+        self.current[key] = entry
+        heapq.heappush(self.heap, entry)
+        if len(self.heap) > 4 * len(self.current) + 64:
+            self.heap = list(self.current.values())
+            heapq.heapify(self.heap)
+
+    def remove(self, key):
+        self.current.pop(key, None)
+
+    def victim(self):
+        while self.heap:
+            entry = self.heap[0]
+            if self.current.get(entry[2]) is entry:
+                return entry[2]
+            heapq.heappop(self.heap)
+        return None
+
+class LFUEviction(_HeapEviction):
+    """Buang pengalaman yang paling jarang dipakai (seri -> yang lebih lama)"""
+
+    def add(self, key, record):
+        self._push(key, 0)
+
+    def touch(self, key):
+        entry = self.current.get(key)
+        if entry is not None:
+            self._push(key, entry[0] + 1)
+
+class PerformanceEviction(_HeapEviction):
+    """Buang pengalaman dengan `performance` terendah lebih dulu"""
+
+    def add(self, key, record):
+        self._push(key, float(record['performance']))
+
+    def touch(self, key):
+        pass
+
+EVICTION_POLICIES = {
+    'lru': LRUEviction,
+    'lfu': LFUEviction,
+    'performance': PerformanceEviction
+}
+
+class PFTCognitiveMemory:
+    def __init__(self, encoder=None, store=None, capacity=None, eviction='lru',
+                 compact_every=100):
         self.short_term = {}  # Memori jangka pendek (konteks saat ini)
-        self.long_term = {}   # Memori jangka panjang (pengalaman)
+        self.encoder = encoder or get_default_encoder()  # Encoder embedding (bercache)
+        self.store = store    # Backend LTM persisten (MStore.MemoryStore), opsional
+        if store is not None:
+            self.long_term = store  # Store sekaligus berperan sebagai indeks embedding
+            self.index = store
+        else:
+            self.long_term = {}   # Memori jangka panjang (pengalaman)
+            self.index = EmbeddingIndex(self.encoder.dim)  # Embedding makna LTM, diisi saat store_experience
         self.theta_params = {'weight_STM': 0.6, 'weight_LTM': 0.4}
         self.phi_threshold = 0.65  # Ambang integrasi
+
+        # Batas kapasitas LTM dan kebijakan eviction (None = tanpa batas)
+        self.capacity = capacity
+        self.eviction = EVICTION_POLICIES[eviction]() if isinstance(eviction, str) else eviction
+        self.compact_every = compact_every  # Kompaksi tiap N pengalaman emergen baru
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'compactions': 0, 'folded': 0}
+        self._emergent_keys = set()
+        self._emergent_pending = 0
+        self._key_sequence = itertools.count()
+        self._lock = threading.RLock()
+        self._compaction_stop = None
+
+        if store is not None and capacity is not None:
+            # Cukup metadata dari log; state dan embedding tidak dibaca
+            for meta in store.metadata():
+                self.eviction.add(meta['key'], meta)
+                if meta['key'].startswith("emergent_"):
+                    self._emergent_keys.add(meta['key'])
+            self._enforce_capacity()
+
+    def new_key(self, prefix="exp"):
+        """Key unik walau banyak request (atau proses) menyimpan pada detik yang sama"""
+        return f"{prefix}_{int(time.time())}_{os.getpid()}_{next(self._key_sequence)}"
     
     def store_experience(self, key, experience):
         """Menyimpan pengalaman ke memori jangka panjang"""
-        self.long_term[key] = {
+        record = {
             'state': experience['state'],
             'meaning': experience['meaning'],
             'performance': experience['performance']
         }
+        embedding = self.get_embedding(experience['meaning'])
+        with self._lock:
+            if self.store is not None:
+                self.store.put(key, record, embedding)
+            else:
+                self.long_term[key] = record
+                self.index.add(key, embedding)
+
+            self.eviction.remove(key)
+            self.eviction.add(key, record)
+            if key.startswith("emergent_"):
+                self._emergent_keys.add(key)
+                self._emergent_pending += 1
+            self._enforce_capacity()
+
+        if self.compact_every and self._emergent_pending >= self.compact_every:
+            self.compact()
+
+    def forget(self, key):
+        """Hapus satu pengalaman dari LTM beserta indeksnya"""
+        with self._lock:
+            if self.store is not None:
+                del self.store[key]
+            else:
+                del self.long_term[key]
+                self.index.remove(key)
+            self.eviction.remove(key)
+            self._emergent_keys.discard(key)
+
+    def _enforce_capacity(self):
+        if self.capacity is not None:
+            while len(self.long_term) > self.capacity:
+                victim = self.eviction.victim()
+                if victim is None:
+                    break
+                self.forget(victim)
+                self.counters['evictions'] += 1
+        # Baris mati di store (eviction, penimpaan) dibuang saat melebihi baris hidup
+        if self.store is not None and self.store.dead > max(len(self.store), 1024):
+            self.store.compact()
+
+    # =============================================
+    # 🗜️ COMPACTION
+    # =============================================
+    def compact(self):
+        """
+        Lipat pengalaman emergent_* yang maknanya sama menjadi satu entri
+        (yang performanya tertinggi). Mengembalikan jumlah entri yang dilipat.
+        """
+        with self._lock:
+            best = {}
+            folded = []
+            for key in sorted(self._emergent_keys):
+                if key not in self.long_term:
+                    self._emergent_keys.discard(key)
+                    continue
+                experience = self.long_term[key]
+                meaning = experience['meaning']
+                kept = best.get(meaning)
+                if kept is None:
+                    best[meaning] = (key, experience['performance'])
+                elif experience['performance'] > kept[1]:
+                    folded.append(kept[0])
+                    best[meaning] = (key, experience['performance'])
+                else:
+                    folded.append(key)
+
+            for key in folded:
+                self.forget(key)
+            self._emergent_pending = 0
+            self.counters['compactions'] += 1
+            self.counters['folded'] += len(folded)
+            return len(folded)
+
+    def start_background_compaction(self, interval=60.0):
+        """Jalankan compact() secara berkala di thread latar belakang"""
+        if self._compaction_stop is not None:
+            return
+        self._compaction_stop = threading.Event()
+        stop = self._compaction_stop
+
+        def loop():
+            while not stop.wait(interval):
+                self.compact()
+
+        threading.Thread(target=loop, name="ltm-compaction", daemon=True).start()
+
+    def stop_background_compaction(self):
+        if self._compaction_stop is not None:
+            self._compaction_stop.set()
+            self._compaction_stop = None
+
+    def stats(self):
+        """Ukuran LTM beserta counter hit, miss, eviction, dan kompaksi"""
+        return {'size': len(self.long_term), 'capacity': self.capacity, **self.counters}
     
     def activate_context(self, context):
         """Mengaktifkan konteks saat ini di memori jangka pendek"""
@@ -25,17 +308,18 @@ class PFTCognitiveMemory:
         Mengaplikasikan operator fusi PFT pada memori
         Mengembalikan keadaan emergent
         """
-        if not self.short_term or not self.long_term:
-            return None
-        
-        # Temukan pengalaman paling relevan di LTM
-        ltm_key, ltm_experience = self.find_most_relevant()
-        
-        # Hitung keselarasan semantik
-        alignment_score = self.calculate_semantic_alignment(
-            self.short_term['meaning'],
-            ltm_experience['meaning']
-        )
+        query = self.get_embedding(self.short_term['meaning']) if self.short_term else None
+        with self._lock:
+            # Pencarian dan pembacaan LTM tidak boleh diselingi compact()/eviction
+            if query is None or not self.long_term:
+                self.counters['misses'] += 1
+                return None
+
+            # Temukan pengalaman paling relevan di LTM; skor pencarian indeks
+            # sudah merupakan keselarasan semantik (cosine similarity)
+            (ltm_key,), (alignment_score,) = self._search(query, 1)
+            ltm_experience = self.long_term[ltm_key]
+        alignment_score = float(alignment_score)
         
         # Hitung kekuatan interaksi
         interaction_strength = 1 - cosine(
@@ -81,8 +365,9 @@ class PFTCognitiveMemory:
         Menghitung indeks emergensi berdasarkan performa
         """
         stm_perf = self.evaluate_performance(self.short_term['state'])
+        # Pengalaman LTM yang dipakai saat fusi sudah tercatat di 'source'
         ltm_perf = self.evaluate_performance(
-            self.long_term[self.find_most_relevant()[0]]['state']
+            self.long_term[fused_state['source'][1]]['state']
         )
         fused_perf = self.evaluate_performance(fused_state['state'])
         
@@ -92,7 +377,7 @@ class PFTCognitiveMemory:
         # Simpan pengalaman emergen jika cukup signifikan
         if emergence_index > 0.15:
             self.store_experience(
-                key=f"emergent_{int(time.time())}",
+                key=self.new_key("emergent"),
                 experience={
                     'state': fused_state['state'],
                     'meaning': fused_state['meaning'],
@@ -104,24 +389,31 @@ class PFTCognitiveMemory:
     
     def find_most_relevant(self):
         """Mencari pengalaman paling relevan di LTM"""
-        best_key = None
-        best_score = -1
-        
-        for key, exp in self.long_term.items():
-            score = self.calculate_semantic_alignment(
-                self.short_term['meaning'],
-                exp['meaning']
-            )
-            if score > best_score:
-                best_score = score
-                best_key = key
-        
-        return best_key, self.long_term[best_key]
+        query = self.get_embedding(self.short_term['meaning'])
+        with self._lock:
+            (best_key,), _ = self._search(query, 1)
+            return best_key, self.long_term[best_key]
+
+    def find_top_k(self, k=5, meaning=None):
+        """Cari k pengalaman LTM paling selaras; mengembalikan (keys, scores)"""
+        if meaning is None:
+            meaning = self.short_term['meaning']
+        query = self.get_embedding(meaning)
+        with self._lock:
+            return self._search(query, k)
+
+    def _search(self, query, k):
+        """find_top_k untuk embedding yang sudah jadi; pemanggil memegang _lock"""
+        keys, scores = self.index.search(query, k)
+        for key in keys:
+            self.eviction.touch(key)
+        self.counters['hits' if keys else 'misses'] += 1
+        return keys, scores
     
     def calculate_semantic_alignment(self, meaning_A, meaning_B):
         """Menghitung keselarasan semantik antara dua makna"""
         # Implementasi sederhana: cosine similarity dari embedding
-        return 1 - cosine(
+        return EmbeddingProvider.similarity(
             self.get_embedding(meaning_A),
             self.get_embedding(meaning_B)
         )
@@ -138,9 +430,8 @@ class PFTCognitiveMemory:
         return " ".join(sorted(combined))
     
     def get_embedding(self, text):
-        """Embedding teks sederhana (bisa diganti dengan model canggih)"""
-        # Implementasi dummy - dalam praktek gunakan model embedding
-        return np.random.rand(100)
+        """Embedding teks melalui encoder bersama (bisa diganti dengan model canggih)"""
+        return self.encoder.embed(text)
     
     def evaluate_performance(self, state):
         """Evaluasi performa keadaan (domain spesifik)"""
@@ -0,0 +1,145 @@
+from collections import deque
+
+# Lexicon bawaan, dipakai jika config.json tidak menyediakan bagian "lexicons"
+DEFAULT_LEXICONS = {
+    "complexity_indicators": ["mengapa", "bagaimana", "solusi", "analisis",
+                              "perbandingan", "dampak", "strategi"],
+    "abstract_indicators": ["secara umum", "prinsipnya", "pada dasarnya",
+                            "konsep", "filosofi", "paradigma"],
+    "concrete_indicators": ["contoh", "langkah", "praktek", "implementasi",
+                            "teknis", "instruksi"]
+}
+
+class LexiconMatcher:
+    """
+    Automaton Aho-Corasick untuk seluruh lexicon sekaligus.
+    Kedalaman kognitif dan level abstraksi dihitung dalam satu kali scan teks,
+    sehingga biaya tidak lagi tumbuh sebanding jumlah frasa x panjang teks.
+    """
+
+    def __init__(self, complexity_indicators=(), abstract_indicators=(),
+                 concrete_indicators=()):
+        self.goto = [{}]      # Transisi per state
+        self.fail = [0]       # Fungsi kegagalan
+        self.outputs = [()]   # Pola yang berakhir di state ini (termasuk via fail)
+        self.patterns = []    # [frasa, bobot_kompleksitas, bobot_abstrak, bobot_konkret]
+        self.lexicons = (tuple(complexity_indicators), tuple(abstract_indicators),
+                         tuple(concrete_indicators))
+        self._stage_matchers = None
+
+        lookup = {}
+        for slot, phrases in enumerate(
+            (complexity_indicators, abstract_indicators, concrete_indicators),
+            start=1
+        ):
+            for phrase in phrases:
+                if not phrase:
+                    continue
+                if phrase not in lookup:
+                    lookup[phrase] = len(self.patterns)
+                    self.patterns.append([phrase, 0, 0, 0])
+                self.patterns[lookup[phrase]][slot] += 1
+
+        # Indikator kompleksitas dicocokkan per kata (semantik `word in list`)
+        for pattern in self.patterns:
+            pattern[1] = min(pattern[1], 1)
+
+        for index, pattern in enumerate(self.patterns):
+            self._insert(pattern[0], index)
+        self._build()
+
+    @classmethod
+    def from_config(cls, config):
+        """Bangun matcher dari bagian "lexicons" pada config.json"""
+        lexicons = {**DEFAULT_LEXICONS, **(config or {}).get("lexicons", {})}
+        return cls(
+            lexicons["complexity_indicators"],
+            lexicons["abstract_indicators"],
+            lexicons["concrete_indicators"]
+        )
+
+    def _insert(self, phrase, index):
+        state = 0
+        for char in phrase:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append(())
+            state = next_state
+        self.outputs[state] += (index,)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.outputs[next_state] += self.outputs[self.fail[next_state]]
+
+    def scan(self, text):
+        """
+        Satu kali scan teks.
+        Mengembalikan (jumlah_kata, jumlah_kata_kompleks, jumlah_abstrak, jumlah_konkret)
+        """
+        text = text.lower()
+        goto, fail, outputs, patterns = self.goto, self.fail, self.outputs, self.patterns
+        last_end = [0] * len(patterns)  # Untuk hitungan non-overlap seperti str.count
+        words = complex_words = abstract = concrete = 0
+        state = 0
+        in_word = False
+        length = len(text)
+
+        for position, char in enumerate(text):
+            if char.isspace():
+                in_word = False
+            elif not in_word:
+                in_word = True
+                words += 1
+
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index in outputs[state]:
+                phrase, is_complex, abstract_weight, concrete_weight = patterns[index]
+                end = position + 1
+                start = end - len(phrase)
+                if abstract_weight or concrete_weight:
+                    if start >= last_end[index]:
+                        last_end[index] = end
+                        abstract += abstract_weight
+                        concrete += concrete_weight
+                if is_complex and (start == 0 or text[start - 1].isspace()) \
+                        and (end == length or text[end].isspace()):
+                    complex_words += 1
+
+        return words, complex_words, abstract, concrete
+
+    def score(self, text):
+        """Hitung (cognitive_depth, abstraction_level) dalam satu kali scan"""
+        words, complex_words, abstract, concrete = self.scan(text)
+        depth = min(complex_words / words, 1.0) if words else 0
+
+        total = abstract + concrete
+        abstraction = abstract / total if total else 0.5
+        return depth, abstraction
+
+    def stage_matchers(self):
+        """
+        (matcher kedalaman kognitif, matcher abstraksi), masing-masing hanya
+        berisi lexicon tahapnya; dipakai bila kedua tahap dihitung terpisah
+        """
+        if self._stage_matchers is None:
+            complexity, abstract, concrete = self.lexicons
+            self._stage_matchers = (
+                LexiconMatcher(complexity),
+                LexiconMatcher((), abstract, concrete)
+            )
+        return self._stage_matchers
@@ -0,0 +1,168 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import nullcontext
+
+# Batas atas bucket (detik), ala Prometheus; bucket terakhir implisit +Inf
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Span kosong bersama: dipakai saat metrik nonaktif (tanpa alokasi per span)
+_NULL_SPAN = nullcontext()
+
+class LatencyHistogram:
+    """Histogram latensi dengan bucket tetap; kuantil diinterpolasi dalam bucket"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.bounds, seconds)  # Batas atas inklusif (le)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q):
+        """Estimasi kuantil q (0-1), dibatasi oleh nilai maksimum teramati"""
+        with self._lock:
+            counts, count, maximum = list(self.counts), self.count, self.max
+        return self._quantile(q, counts, count, maximum)
+
+    def _quantile(self, q, counts, count, maximum):
+        # Dihitung dari salinan counts agar satu snapshot konsisten dengan dirinya sendiri
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else maximum
+                estimate = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(estimate, maximum)
+            cumulative += bucket_count
+        return maximum
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            count, total, maximum = self.count, self.sum, self.max
+        summary = {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0,
+            'max': maximum
+        }
+        for q in QUANTILES:
+            summary[f"p{round(q * 100)}"] = self._quantile(q, counts, count, maximum)
+        summary['buckets'] = dict(zip([*map(str, self.bounds), '+Inf'], counts))
+        return summary
+
+class _Span:
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+class LatencyMetrics:
+    """
+    Registri histogram latensi per tahap. span(stage) dipakai sebagai context
+    manager di setiap tahap alur; saat nonaktif, span() mengembalikan context
+    kosong bersama sehingga overhead hampir nol.
+    """
+
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.histograms = {}  # stage -> LatencyHistogram
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, stage):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def timed(self, stage):
+        """Dekorator: ukur setiap panggilan fungsi sebagai satu span"""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram(self.buckets))
+        histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    # =============================================
+    # 📤 EXPORT
+    # =============================================
+    def snapshot(self):
+        """Ringkasan per tahap: count, sum, mean, max, p50/p95/p99, dan bucket"""
+        return {stage: histogram.snapshot() for stage, histogram in sorted(self.histograms.items())}
+
+    def to_json(self, indent=None):
+        return json.dumps({'timestamp': time.time(), 'stages': self.snapshot()}, indent=indent)
+
+    def to_prometheus(self, name="didactic_stage_latency_seconds"):
+        """Format teks eksposisi Prometheus (histogram dengan label stage)"""
+        lines = [
+            f"# HELP {name} Latency of pipeline stages in seconds.",
+            f"# TYPE {name} histogram"
+        ]
+        for stage, summary in self.snapshot().items():
+            label = stage.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, bucket_count in summary['buckets'].items():
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {float(summary["sum"])!r}')
+            lines.append(f'{name}_count{{stage="{label}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+# Registri bersama (nonaktif secara default)
+_default_metrics = LatencyMetrics()
+
+def get_metrics():
+    return _default_metrics
+
+def set_metrics(metrics):
+    global _default_metrics
+    _default_metrics = metrics
@@ -0,0 +1,360 @@
+import json
+import os
+from collections.abc import Mapping
+import numpy as np
+from numpy.lib.format import open_memmap
+from HMemory import EmbeddingIndex, top_k
+
+# Offset penanda baris yang belum di-commit (harus > offset valid mana pun)
+_UNCOMMITTED = np.iinfo(np.int64).max
+
+class MemoryStore(Mapping):
+    """
+    Backend LTM persisten di disk:
+    - meta.jsonl     : log metadata append-only (key, meaning, performance)
+    - embeddings.npy : matriks embedding ternormalisasi (memory-mapped)
+    - states.npy     : vektor state per pengalaman (memory-mapped)
+    - offsets.npy    : offset byte record meta per baris; sekaligus penanda commit
+    - flags.npy      : 1 = baris hidup, 0 = dihapus/ditimpa
+    - generation     : nomor generasi aktif setelah compact(); file generasi
+                       g > 0 bernama meta.g.jsonl, embeddings.g.npy, dst.
+
+    Satu proses penulis, banyak proses pembaca read-only. Pembaca mengakses
+    matriks secara zero-copy lewat page cache yang sama, dan startup tidak
+    mem-parse log maupun meng-embed ulang apa pun.
+    """
+    ARRAYS = ('embeddings', 'states', 'flags', 'offsets')
+
+    def __init__(self, path, dim=100, state_dim=16, capacity=1024, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self._rows = None     # key -> baris, dibangun malas dari meta.jsonl
+        self._scanned = 0     # Baris ter-commit yang sudah masuk ke _rows
+        self._recent = {}     # key -> baris dari hasil pencarian terakhir
+        self._generation = self._read_generation()
+
+        if not os.path.exists(self._file('offsets')):
+            if readonly:
+                raise FileNotFoundError(f"Memory store not found: {path}")
+            os.makedirs(path, exist_ok=True)
+            self._create(capacity, dim, state_dim)
+        self._open()
+
+    # =============================================
+    # 📂 FILE LAYOUT
+    # =============================================
+    def _file(self, name, generation=None):
+        return os.path.join(self.path, name + self._suffix(generation) + ".npy")
+
+    @property
+    def _meta_path(self):
+        return self._meta_file()
+
+    def _meta_file(self, generation=None):
+        return os.path.join(self.path, "meta" + self._suffix(generation) + ".jsonl")
+
+    def _suffix(self, generation):
+        generation = self._generation if generation is None else generation
+        return f".{generation}" if generation else ""
+
+    @property
+    def _generation_path(self):
+        return os.path.join(self.path, "generation")
+
+    def _read_generation(self):
+        try:
+            with open(self._generation_path, encoding="utf-8") as handle:
+                return int(handle.read())
+        except FileNotFoundError:
+            return 0  # Store yang belum pernah dimampatkan
+
+    def _create(self, capacity, dim, state_dim):
+        specs = {
+            'embeddings': (np.float32, (capacity, dim), 0),
+            'states': (np.float64, (capacity, state_dim), 0),
+            'flags': (np.uint8, (capacity,), 0),
+            'offsets': (np.int64, (capacity,), _UNCOMMITTED)
+        }
+        for name in self.ARRAYS:
+            dtype, shape, fill = specs[name]
+            array = open_memmap(self._file(name), mode='w+', dtype=dtype, shape=shape)
+            array[:] = fill
+            array.flush()
+            del array
+        open(self._meta_path, 'ab').close()
+
+    def _open(self):
+        mode = 'r' if self.readonly else 'r+'
+        while True:
+            self._generation = self._read_generation()
+            try:
+                arrays = {name: np.load(self._file(name), mmap_mode=mode) for name in self.ARRAYS}
+                self._inode = os.stat(self._file('offsets')).st_ino
+                self._meta_reader = open(self._meta_path, 'rb')
+            except FileNotFoundError:
+                # compact() menerbitkan generasi baru dan menghapus yang lama di tengah pembukaan
+                if self._read_generation() != self._generation:
+                    continue
+                raise
+            break
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        if not self.readonly:
+            self._meta_writer = open(self._meta_path, 'ab')
+
+    def refresh(self):
+        """Buka ulang matriks jika penulis sudah memperbesar atau memampatkan file"""
+        if (self._read_generation() != self._generation
+                or os.stat(self._file('offsets')).st_ino != self._inode):
+            generation = self._generation
+            self.close()
+            self._open()
+            if self._generation != generation:
+                self._rows = None  # Baris bergeser setelah compact()
+                self._recent = {}
+
+    def close(self):
+        self._meta_reader.close()
+        if not self.readonly:
+            self.flush()
+            self._meta_writer.close()
+        for name in self.ARRAYS:
+            setattr(self, name, None)
+
+    def flush(self):
+        for name in self.ARRAYS:
+            getattr(self, name).flush()
+
+    @property
+    def dim(self):
+        return self.embeddings.shape[1]
+
+    @property
+    def capacity(self):
+        return min(len(getattr(self, name)) for name in self.ARRAYS)
+
+    @property
+    def count(self):
+        """Jumlah baris yang sudah di-commit (hidup maupun mati)"""
+        committed = int(np.searchsorted(self.offsets, _UNCOMMITTED))
+        return min(committed, self.capacity)
+
+    def _grow(self):
+        """Gandakan kapasitas; file diganti atomik, offsets paling akhir (penanda commit)"""
+        capacity = self.capacity * 2
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            temp = self._file(name) + ".tmp"
+            grown = open_memmap(temp, mode='w+', dtype=old.dtype,
+                                shape=(capacity,) + old.shape[1:])
+            grown[:len(old)] = old
+            grown[len(old):] = _UNCOMMITTED if name == 'offsets' else 0
+            grown.flush()
+            del grown
+            os.replace(temp, self._file(name))
+        self.close()
+        self._open()
+
+    # =============================================
+    # 🔑 KEY LOOKUP
+    # =============================================
+    def _read_meta(self, row):
+        self._meta_reader.seek(int(self.offsets[row]))
+        return json.loads(self._meta_reader.readline())
+
+    def _scan(self, n):
+        """(baris, metadata) untuk setiap baris hidup di bawah n; satu kali baca meta.jsonl"""
+        offsets, live = self.offsets[:n], self.flags[:n]
+        position = 0
+        self._meta_reader.seek(0)
+        for line in self._meta_reader:
+            # Baris log tanpa offset ter-commit (penulis terhenti) dilewati
+            row = int(np.searchsorted(offsets, position))
+            if row < n and offsets[row] == position and live[row]:
+                yield row, json.loads(line)
+            position += len(line)
+
+    def _key_rows(self):
+        """
+        Peta key -> baris; dibangun saat operasi berbasis key pertama, lalu
+        hanya baris yang di-commit penulis sesudahnya yang dibaca. Entri bisa
+        menunjuk baris yang sudah mati, jadi pemanggil tetap memeriksa flags.
+        """
+        if self.readonly:
+            self.refresh()
+        n = self.count
+        if self._rows is None:
+            self._rows = {meta['key']: row for row, meta in self._scan(n)}
+        else:
+            for row in range(self._scanned, n):
+                if self.flags[row]:
+                    self._rows[self._read_meta(row)['key']] = row
+        self._scanned = n
+        return self._rows
+
+    def metadata(self):
+        """
+        Metadata (key, meaning, performance) semua pengalaman hidup tanpa
+        menyentuh matriks state; peta key ikut dibangun dari bacaan yang sama
+        """
+        rows, records = {}, []
+        n = self.count
+        for row, meta in self._scan(n):
+            rows[meta['key']] = row
+            records.append(meta)
+        self._rows, self._scanned = rows, n
+        return records
+
+    def _row_of(self, key):
+        row = self._recent.get(key)
+        if row is not None and self.flags[row]:
+            return row
+        row = self._key_rows().get(key)
+        return row if row is not None and self.flags[row] else None
+
+    def __getitem__(self, key):
+        row = self._row_of(key)
+        if row is None:
+            raise KeyError(key)
+        meta = self._read_meta(row)
+        return {
+            'state': self.states[row, :meta['state_len']].tolist(),
+            'meaning': meta['meaning'],
+            'performance': meta['performance']
+        }
+
+    def __contains__(self, key):
+        return self._row_of(key) is not None
+
+    def __iter__(self):
+        return iter([key for key, row in self._key_rows().items() if self.flags[row]])
+
+    def __len__(self):
+        return int(np.count_nonzero(self.flags[:self.count]))
+
+    # =============================================
+    # ✍️ WRITE PATH
+    # =============================================
+    def put(self, key, experience, embedding):
+        """Tambahkan pengalaman; versi lama dengan key yang sama ditandai mati"""
+        if self.readonly:
+            raise PermissionError("Memory store opened read-only")
+
+        state = np.asarray(experience['state'], dtype=np.float64)
+        if len(state) > self.states.shape[1]:
+            raise ValueError(f"State dimension {len(state)} exceeds store state_dim {self.states.shape[1]}")
+
+        rows = self._key_rows()
+        row = self.count
+        if row == self.capacity:
+            self._grow()
+
+        self.embeddings[row] = EmbeddingIndex.normalize(embedding)
+        self.states[row] = 0
+        self.states[row, :len(state)] = state
+
+        line = json.dumps({
+            'key': key,
+            'meaning': experience['meaning'],
+            'performance': float(experience['performance']),
+            'state_len': len(state)
+        }, ensure_ascii=False).encode('utf-8') + b"\n"
+        offset = self._meta_writer.seek(0, os.SEEK_END)
+        self._meta_writer.write(line)
+        self._meta_writer.flush()
+
+        # Commit: offset terisi -> baris terlihat oleh pembaca
+        self.offsets[row] = offset
+        self.flags[row] = 1
+        if key in rows:
+            self.flags[rows[key]] = 0
+        rows[key] = row
+        self._scanned = row + 1
+
+    def __delitem__(self, key):
+        if self.readonly:
+            raise PermissionError("Memory store opened read-only")
+        row = self._key_rows().pop(key)
+        self.flags[row] = 0
+        self._recent.pop(key, None)
+
+    @property
+    def dead(self):
+        """Baris ter-commit yang sudah mati (dihapus, dibuang, atau ditimpa)"""
+        return self.count - len(self)
+
+    def compact(self):
+        """
+        Tulis ulang store hanya dengan baris hidup (urutan tetap) sehingga
+        meta.jsonl dan matriks tidak tumbuh tanpa batas akibat eviction.
+        Hasilnya ditulis sebagai generasi baru lalu diterbitkan dengan
+        mengganti file generation secara atomik, jadi pembaca tidak pernah
+        memasangkan metadata baru dengan offsets lama; pembaca berpindah
+        lewat refresh(). Mengembalikan jumlah baris yang dibuang.
+        """
+        if self.readonly:
+            raise PermissionError("Memory store opened read-only")
+        n = self.count
+        live = np.flatnonzero(self.flags[:n])
+        dropped = n - len(live)
+        if not dropped:
+            return 0
+
+        self.flush()
+        old_generation = self._generation
+        generation = old_generation + 1
+        capacity = max(2 * len(live), 16)
+        offsets = np.full(capacity, _UNCOMMITTED, dtype=np.int64)
+        with open(self._meta_file(generation), 'wb') as meta:
+            for index, row in enumerate(live.tolist()):
+                self._meta_reader.seek(int(self.offsets[row]))
+                offsets[index] = meta.tell()
+                meta.write(self._meta_reader.readline())
+
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            compacted = open_memmap(self._file(name, generation), mode='w+', dtype=old.dtype,
+                                    shape=(capacity,) + old.shape[1:])
+            if name == 'offsets':
+                compacted[:] = offsets
+            else:
+                compacted[:len(live)] = 1 if name == 'flags' else old[live]
+                compacted[len(live):] = 0
+            compacted.flush()
+            del compacted
+
+        self.close()
+        with open(self._generation_path + ".tmp", 'w', encoding="utf-8") as handle:
+            handle.write(str(generation))
+        os.replace(self._generation_path + ".tmp", self._generation_path)
+        # Pembaca yang masih memetakan generasi lama tetap valid; file hanya di-unlink
+        for path in [self._file(name, old_generation) for name in self.ARRAYS] + [self._meta_file(old_generation)]:
+            os.remove(path)
+        self._open()
+        self._rows = None
+        self._scanned = 0
+        self._recent = {}
+        return dropped
+
+    # =============================================
+    # 🔍 SEARCH
+    # =============================================
+    def search(self, query, k=1):
+        """Kembalikan (keys, scores) untuk k embedding hidup paling mirip"""
+        self.refresh()
+        n = self.count
+        if not n:
+            return [], np.empty(0, dtype=np.float32)
+
+        scores = self.embeddings[:n] @ EmbeddingIndex.normalize(query)
+        scores[self.flags[:n] == 0] = -np.inf
+        top = top_k(scores, min(k, len(self)))
+
+        if len(self._recent) > 4096:
+            self._recent.clear()
+        keys = []
+        for row in top:
+            key = self._read_meta(row)['key']
+            self._recent[key] = int(row)
+            keys.append(key)
+        return keys, scores[top]
@@ -0,0 +1,494 @@
+import hashlib
+import heapq
+import io
+import json
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import nullcontext
+from dataclasses import InitVar, dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+from MProof import CommittedFacts, FactCommitment, MerkleTree
+from RTrace import TraceBuffer, TraceEvent
+
+# =============================================
+# 🧠 ⊕ REASONING ENGINE
+# =============================================
+class LogicOperator(Enum):
+    AND = "∧"
+    OR = "∨"
+    OPLUS = "⊕"  # Modular composition
+    NOT = "¬"
+    IMPLIES = "→"
+
+@dataclass
+class LogicRule:
+    """Represents a single logic rule"""
+    name: str
+    conditions: List[str]
+    conclusion: str
+    operator: LogicOperator
+    confidence: float = 1.0
+    tags: List[str] = field(default_factory=list)  # e.g., ["medis", "respirasi"]
+
+class _LazyField:
+    """
+    Write-once dataclass field whose stored None means "derive on first read":
+    the class access returns None, so dataclass uses it as the field default.
+    A given value is stored through `freeze`; reassigning raises AttributeError.
+    """
+
+    def __init__(self, derive, freeze=None):
+        self.derive = derive
+        self.freeze = freeze
+
+    def __set_name__(self, owner, name):
+        self.slot = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return None
+        value = instance.__dict__[self.slot]
+        if value is None:
+            value = instance.__dict__[self.slot] = self.derive(instance)
+        return value
+
+    def __set__(self, instance, value):
+        if self.slot in instance.__dict__:
+            raise AttributeError(f"{self.slot[1:]} is derived from the operands; use dataclasses.replace")
+        if value is not None and self.freeze is not None:
+            value = self.freeze(value)
+        instance.__dict__[self.slot] = value
+
+def _flatten_conditions(rule: "ComposedRule") -> Tuple[str, ...]:
+    # Pre-order over the operand DAG, shared nodes visited once: same first-occurrence
+    # order as deduplicating left + right at every level, without per-node copies
+    conditions, seen = {}, set()
+    stack = [rule.right, rule.left]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, ComposedRule) and node._conditions is None:
+            stack += (node.right, node.left)
+        else:
+            conditions.update(dict.fromkeys(node.conditions))
+    return tuple(conditions)
+
+def _render_conclusion(rule: "ComposedRule") -> str:
+    # Streams "(A) ∧ (B)" into one buffer; operands that were never read stay unrendered
+    out = io.StringIO()
+    stack = [")", rule.right, ") ∧ (", rule.left, "("]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.write(item)
+        elif isinstance(item, ComposedRule) and item._conclusion is None:
+            stack += (")", item.right, ") ∧ (", item.left, "(")
+        else:
+            out.write(item.conclusion)
+    return out.getvalue()
+
+def _operand(rule: LogicRule) -> LogicRule:
+    """A ⊕ operand as it is now: composed rules are immutable, plain rules are copied with tuple fields"""
+    if isinstance(rule, ComposedRule):
+        return rule
+    return LogicRule(rule.name, tuple(rule.conditions), rule.conclusion, rule.operator,
+                     rule.confidence, tuple(rule.tags))
+
+@dataclass
+class ComposedRule(LogicRule):
+    """
+    A ⊕ B as a node of the composition DAG. The operands are captured at
+    construction (left/right), so changing an operand rule afterwards never
+    changes this one. Conditions (deduplicated, first occurrence order, as a
+    tuple) and the conclusion "(A) ∧ (B)" are derived only when first read
+    and cannot be reassigned; use dataclasses.replace for a changed copy.
+    left/right are init-only, so asdict and == do not walk the DAG.
+    """
+    conditions: Tuple[str, ...] = _LazyField(_flatten_conditions, tuple)
+    conclusion: str = _LazyField(_render_conclusion)
+    operator: LogicOperator = LogicOperator.OPLUS
+    confidence: float = None  # None = min of the operands
+    left: InitVar[LogicRule] = None
+    right: InitVar[LogicRule] = None
+
+    def __post_init__(self, left: LogicRule, right: LogicRule):
+        self.left, self.right = _operand(left), _operand(right)
+        if self.confidence is None:
+            self.confidence = min(self.left.confidence, self.right.confidence)
+
+@dataclass
+class ReasoningTrace:
+    """Tracks the reasoning process"""
+    steps: Sequence[str]  # TraceView: events formatted on access
+    rules_applied: List[str]
+    final_conclusion: str
+    proof_hash: str
+    fact_root: str = ""  # Merkle root (hex) over facts in insertion order
+    rules_root: str = ""  # Merkle root (hex) over applied rules in firing order
+
+def rule_to_record(rule: LogicRule) -> Dict[str, Any]:
+    """JSON-ready rule record (one line of dump_jsonl)"""
+    return {
+        "name": rule.name,
+        "conditions": list(rule.conditions),
+        "conclusion": rule.conclusion,
+        "operator": rule.operator.name,
+        "confidence": rule.confidence,
+        "tags": list(rule.tags)
+    }
+
+_OPERATOR_KEYS = {**{operator.value: operator for operator in LogicOperator},
+                  **{operator.name: operator for operator in LogicOperator}}
+
+def rule_from_record(record: Dict[str, Any]) -> LogicRule:
+    """Inverse of rule_to_record; operator may be a name ("AND") or symbol ("∧"), default AND"""
+    return LogicRule(
+        name=record["name"],
+        conditions=list(record["conditions"]),
+        conclusion=record["conclusion"],
+        operator=_OPERATOR_KEYS[record.get("operator", "AND")],
+        confidence=float(record.get("confidence", 1.0)),
+        tags=list(record.get("tags", []))
+    )
+
+class OPlusReasoningEngine:
+    """
+    Core reasoning engine using ⊕ operator for modular logic composition
+    """
+    
+    def __init__(self, confidence_threshold: float = 0.75, metrics: Any = None,
+                 trace_capacity: int = 10000, trace_verbosity: int = TraceBuffer.ALL):
+        self.rules: Dict[str, LogicRule] = {}
+        self.facts: Dict[str, bool] = CommittedFacts()  # Merkle commitment updated on every write
+        self.inferred_facts: Dict[str, bool] = {}  # For nested rule support
+        self.trace = TraceBuffer(trace_capacity, trace_verbosity)  # Structured, bounded (capacity=None: unbounded)
+        self.threshold = confidence_threshold  # Confidence threshold
+        self.metrics = metrics  # Optional latency recorder with span(stage), e.g. LMetrics.LatencyMetrics
+        # Forward-chaining index: condition -> [(rule order, rule name)], caught up by _ensure_index
+        self._condition_index: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        self._unconditional: List[Tuple[int, str]] = []
+        self._rule_order: Dict[str, int] = {}
+        self._condition_counts: Dict[str, int] = {}  # Distinct conditions per rule
+        self._index_stale = False
+        self._added_rules = 0  # Equals len(self.rules) unless rules were deleted since the last rebuild
+        self._compositions: Dict[Tuple[str, str], str] = {}  # (A, B) -> composed rule (hash-consing)
+        self.applied_tree = MerkleTree()  # Rules fired since reason() began, one leaf appended per firing
+
+    def _span(self, stage: str):
+        """Timing span for a reasoning stage (no-op without a metrics recorder)"""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.span(stage)
+    
+    def add_rule(self, rule: LogicRule):
+        """Add a logic rule to the engine"""
+        if rule.name in self.rules:
+            self._index_stale = True  # Replaced rule: rebuild the index lazily
+            self._compositions.clear()  # Compositions may reference the old rule
+        else:
+            self._added_rules += 1
+        self.rules[rule.name] = rule  # New rules are indexed lazily (composed conditions stay unflattened)
+        self.trace.record(TraceEvent.RULE_ADDED, rule.name)
+
+    def add_rules(self, rules: List[LogicRule]) -> int:
+        """Add many rules (same result as add_rule on each); returns the count"""
+        for rule in rules:
+            self.add_rule(rule)
+        return len(rules)
+
+    def _index_rule(self, order: int, rule: LogicRule):
+        self._rule_order[rule.name] = order
+        entry = (order, rule.name)
+        conditions = dict.fromkeys(rule.conditions)
+        self._condition_counts[rule.name] = len(conditions)
+        if not conditions:
+            self._unconditional.append(entry)
+        for condition in conditions:
+            self._condition_index[condition].append(entry)
+
+    def _ensure_index(self):
+        """Index rules added since the last call; rebuild if rules were replaced or removed"""
+        # Deleting from self.rules (even if the rule is added again, moving it to the end) breaks the count
+        if self._index_stale or len(self.rules) != self._added_rules:
+            self._condition_index = defaultdict(list)
+            self._unconditional = []
+            self._rule_order = {}
+            self._condition_counts = {}
+            self._index_stale = False
+            self._added_rules = len(self.rules)
+        indexed = len(self._rule_order)
+        for order, rule in enumerate(islice(self.rules.values(), indexed, None), indexed):
+            self._index_rule(order, rule)
+
+    def _holds(self, condition: str) -> bool:
+        """Truth of a condition; inferred facts take precedence over given facts"""
+        if condition in self.inferred_facts:
+            return bool(self.inferred_facts[condition])
+        return bool(self.facts.get(condition, False))
+    
+    def add_fact(self, fact: str, value: bool):
+        """Add a fact to the knowledge base"""
+        self.facts[fact] = value
+        self.trace.record(TraceEvent.FACT_ADDED, fact, value)
+    
+    def fact_root(self) -> str:
+        """Merkle root (hex) of the current facts; O(log n) to refresh after add_fact"""
+        return FactCommitment.root_of(self.facts)
+
+    def prove_fact(self, fact: str) -> Dict[str, Any]:
+        """Membership proof for a single fact against fact_root()"""
+        tree = self.facts.merkle_tree()
+        index = self.facts.position(fact)
+        return {
+            "fact": fact,
+            "value": self.facts[fact],
+            "index": index,
+            "path": tree.proof(index),
+            "root": tree.root().hex()
+        }
+
+    def oplus_compose(self, rule_a: str, rule_b: str) -> str:
+        """
+        ⊕ Operator: Compose two rules modularly
+        A ⊕ B = combined reasoning from both rules.
+        Compositions are hash-consed: composing the same pair again returns the
+        existing rule instead of adding a duplicate.
+        """
+        composed_name = self._compositions.get((rule_a, rule_b))
+        if composed_name is not None and composed_name in self.rules:
+            return composed_name
+        if rule_a not in self.rules or rule_b not in self.rules:
+            raise ValueError("Rules not found")
+        
+        # Create composed rule: a DAG node referencing both operands
+        composed_name = f"{rule_a}_⊕_{rule_b}"
+        self.add_rule(ComposedRule(composed_name, left=self.rules[rule_a], right=self.rules[rule_b]))
+        self._compositions[(rule_a, rule_b)] = composed_name
+        self.trace.record(TraceEvent.COMPOSED, rule_a, rule_b, composed_name)
+        
+        return composed_name
+
+    def compose_many(self, pairs) -> List[str]:
+        """Bulk ⊕ over (A, B) pairs; repeated pairs share one composed rule"""
+        return [self.oplus_compose(rule_a, rule_b) for rule_a, rule_b in pairs]
+    
+    def evaluate_rule(self, rule_name: str) -> Tuple[bool, float]:
+        """Evaluate if a rule can be applied given current facts"""
+        if rule_name not in self.rules:
+            return False, 0.0
+        
+        rule = self.rules[rule_name]
+        
+        # Check if all conditions are satisfied (facts and inferred_facts)
+        satisfied_conditions = sum(1 for condition in rule.conditions if self._holds(condition))
+        return self._apply_rule(rule_name, rule, satisfied_conditions)
+
+    def _apply_rule(self, rule_name: str, rule: LogicRule, satisfied_conditions: int) -> Tuple[bool, float]:
+        """Apply threshold, trace and inference for a rule with the given satisfied-condition count"""
+        final_rule_fires, confidence_score = self._check_rule(
+            rule_name, len(rule.conditions), rule.confidence, satisfied_conditions
+        )
+        if final_rule_fires:
+            # 5. Support nested rules - add conclusion to inferred_facts
+            self.inferred_facts[rule.conclusion] = True
+            self._commit_applied(rule_name)
+        return final_rule_fires, confidence_score
+
+    def _commit_applied(self, rule_name: str):
+        self.applied_tree.append(MerkleTree.leaf_hash(rule_name.encode()))
+
+    def _check_rule(self, rule_name: str, condition_count: int, rule_confidence: float,
+                    satisfied_conditions: int) -> Tuple[bool, float]:
+        """Confidence threshold and trace entry for a rule (no inference)"""
+        # 1. Separate rule fires logic and confidence calculation
+        rule_fires = satisfied_conditions == condition_count
+        
+        # Calculate satisfaction ratio and confidence score
+        satisfaction_ratio = satisfied_conditions / condition_count if condition_count else 1.0
+        confidence_score = satisfaction_ratio * rule_confidence
+        
+        # 2. Apply confidence threshold
+        rule_passes_threshold = confidence_score >= self.threshold
+        final_rule_fires = rule_fires and rule_passes_threshold
+        
+        if final_rule_fires:
+            # 6. Add confidence to trace log
+            self.trace.record(TraceEvent.RULE_FIRED, rule_name, confidence_score)
+        elif rule_fires and not rule_passes_threshold:
+            self.trace.record(TraceEvent.BELOW_THRESHOLD, rule_name, confidence_score, self.threshold)
+        
+        return final_rule_fires, confidence_score
+    
+    def reason(self, mode: str = "sequential") -> ReasoningTrace:
+        """
+        Main reasoning loop.
+        mode="sequential": one pass over the rules in insertion order (nested rules
+        fire only if their premises were derived earlier in the same pass).
+        mode="forward": forward chaining to fixpoint; each rule fires at most once.
+        """
+        self.applied_tree = MerkleTree()
+        if mode == "sequential":
+            applied_rules, conclusions = self._reason_sequential()
+        elif mode == "forward":
+            applied_rules, conclusions = self._reason_forward()
+        else:
+            raise ValueError(f"Unknown reasoning mode: {mode}")
+        return self._build_trace(applied_rules, conclusions)
+
+    def _reason_sequential(self) -> Tuple[List[str], List[str]]:
+        applied_rules = []
+        conclusions = []
+        
+        # Apply all rules that can fire
+        with self._span("reason.evaluate"):
+            for rule_name, rule in self.rules.items():
+                fires, confidence = self.evaluate_rule(rule_name)
+                if fires:
+                    applied_rules.append(rule_name)
+                    conclusions.append(rule.conclusion)
+        return applied_rules, conclusions
+
+    def _reason_forward(self) -> Tuple[List[str], List[str]]:
+        """
+        Agenda-based forward chaining. Each rule keeps a count of unsatisfied
+        conditions; a newly true fact only visits the rules indexed under it, and
+        a rule whose count reaches zero goes on the agenda (ordered by insertion).
+        """
+        applied_rules = []
+        conclusions = []
+        with self._span("reason.forward"):
+            self._ensure_index()
+            unsatisfied: Dict[str, int] = {}
+            agenda = list(self._unconditional)
+            heapq.heapify(agenda)
+            seen = set()
+
+            def assert_fact(fact: str):
+                # Decrement the rules waiting on this fact (once per fact)
+                if fact in seen:
+                    return
+                seen.add(fact)
+                for entry in self._condition_index.get(fact, ()):
+                    rule_name = entry[1]
+                    remaining = unsatisfied.get(rule_name)
+                    if remaining is None:
+                        remaining = self._condition_counts[rule_name]
+                    unsatisfied[rule_name] = remaining - 1
+                    if remaining == 1:
+                        heapq.heappush(agenda, entry)
+
+            for fact in [*self.facts, *self.inferred_facts]:
+                if self._holds(fact):
+                    assert_fact(fact)
+
+            while agenda:
+                _, rule_name = heapq.heappop(agenda)
+                rule = self.rules[rule_name]
+                fires, confidence = self._apply_rule(rule_name, rule, len(rule.conditions))
+                if fires:
+                    applied_rules.append(rule_name)
+                    conclusions.append(rule.conclusion)
+                    assert_fact(rule.conclusion)
+        return applied_rules, conclusions
+
+    def _build_trace(self, applied_rules: List[str], conclusions: List[str]) -> ReasoningTrace:
+        """Final conclusion and proof hash shared by all reasoning modes"""
+        # Generate final conclusion
+        final_conclusion = " ∧ ".join(conclusions) if conclusions else "No conclusion"
+        
+        # Generate proof hash (ZKP emulation) from the Merkle roots of facts and applied rules;
+        # both trees are maintained incrementally, so only their dirty paths are hashed here
+        with self._span("reason.proof"):
+            fact_root = self.fact_root()
+            rules_root = self.applied_tree.root().hex()
+            proof_data = json.dumps([fact_root, rules_root, final_conclusion], ensure_ascii=False)
+            proof_hash = hashlib.sha256(proof_data.encode()).hexdigest()
+        
+        return ReasoningTrace(
+            steps=self.trace.snapshot(),
+            rules_applied=applied_rules,
+            final_conclusion=final_conclusion,
+            proof_hash=proof_hash[:16],  # Shortened for display
+            fact_root=fact_root,
+            rules_root=rules_root
+        )
+    
+    def export_trace(self) -> Dict[str, Any]:
+        """7. Export trace to JSON for web UI or training data"""
+        return {
+            "trace": list(self.trace),
+            "facts": dict(self.facts.items()),
+            "inferred_facts": dict(self.inferred_facts.items()),
+            "rules": {name: {
+                "conditions": rule.conditions,
+                "conclusion": rule.conclusion,
+                "confidence": rule.confidence,
+                "tags": rule.tags
+            } for name, rule in self.rules.items()},
+            "threshold": self.threshold,
+            "timestamp": time.time()
+        }
+
+    def dump_jsonl(self, stream):
+        """Write facts, then rules, one JSON record per line (read back with load_jsonl)"""
+        for fact, value in self.facts.items():
+            stream.write(json.dumps({"fact": fact, "value": value}, ensure_ascii=False) + "\n")
+        for rule in self.rules.values():
+            stream.write(json.dumps(rule_to_record(rule), ensure_ascii=False) + "\n")
+
+    def load_jsonl(self, stream, chunk_size: int = 10000) -> Dict[str, int]:
+        """
+        Stream a knowledge base from JSONL (path or text stream). A line
+        {"fact": ..., "value": ...} adds a fact; any other line is a rule record
+        (see rule_from_record). Rules reach add_rules in chunks of chunk_size,
+        so memory is bounded by one chunk however large the file is.
+        """
+        if isinstance(stream, str):
+            with open(stream, encoding="utf-8") as handle:
+                return self.load_jsonl(handle, chunk_size)
+        counts = {"rules": 0, "facts": 0}
+        first_line = 1
+        while True:
+            lines = list(islice(stream, chunk_size))
+            if not lines:
+                return counts
+            self._load_records(lines, first_line, counts)
+            first_line += len(lines)
+
+    def _load_records(self, lines: List[str], first_line: int, counts: Dict[str, int]):
+        numbered = [(number, line) for number, line in enumerate(lines, first_line) if line.strip()]
+        try:
+            # One decode per chunk; a bad chunk is decoded again line by line to locate the error
+            records = json.loads("[" + ",".join(line for _, line in numbered) + "]")
+            if len(records) != len(numbered):
+                raise ValueError("more than one record on a line")
+        except ValueError:
+            records = []
+            for number, line in numbered:
+                try:
+                    records.append(json.loads(line))
+                except ValueError as error:
+                    raise ValueError(f"line {number}: invalid knowledge record ({error!r})") from error
+        rules = []
+        for (number, _), record in zip(numbered, records):
+            try:
+                if "fact" in record:
+                    counts["rules"] += self.add_rules(rules)  # Keep the file order
+                    rules = []
+                    self.add_fact(record["fact"], bool(record.get("value", True)))
+                    counts["facts"] += 1
+                else:
+                    rules.append(rule_from_record(record))
+            except (KeyError, TypeError) as error:
+                raise ValueError(f"line {number}: invalid knowledge record ({error!r})") from error
+        counts["rules"] += self.add_rules(rules)
+
+    def snapshot(self, path: str):
+        """Binary snapshot of rules and facts; load it with CompactReasoningEngine.restore"""
+        from CEngine import CompactReasoningEngine
+        CompactReasoningEngine.from_engine(self).snapshot(path)
@@ -1,51 +1,133 @@
+from DAnalyzer import DimensionAnalyzer
+from ECalculator import EntropyCalculator
+from EProvider import EmbeddingProvider
+from HMemory import PFTCognitiveMemory
+from LMetrics import get_metrics
 from UAnalyszer import UncertaintyAnalyzer
 
 class OutputGenerator:
-    def __init__(self, role, cognitive_style, processing_style):
+    def __init__(self, role, cognitive_style, processing_style, encoder=None, memory=None):
         self.role = role
         self.cognitive_style = cognitive_style
         self.processing_style = processing_style
-        self.memory = PFTCognitiveMemory()
+        self.memory = memory or PFTCognitiveMemory(encoder)
         self.uncertainty_analyzer = UncertaintyAnalyzer()
-    
-    def generate_output(self, input_text, model_generator):
-        # Analisis input
-        uncertainty = self.uncertainty_analyzer.analyze_uncertainty(input_text)
-        
-        # Aktifkan konteks saat ini di STM
-        current_context = self.create_context(input_text, uncertainty)
-        self.memory.activate_context(current_context)
-        
-        # Lakukan fusi memori
-        fused_state = self.memory.pft_fusion_operator()
-        
-        if fused_state:
-            emergence_index = self.memory.calculate_emergence_index(fused_state)
-            
-            # Bangun prompt dengan pengetahuan emergen
-            prompt = self.create_prompt(
-                input_text, 
-                fused_state['meaning'], 
-                emergence_index
+        self.output_entropy = EntropyCalculator.StreamingEntropy()
+        self._role_context = None  # Dihitung sekali; generator dapat dipakai ulang
+
+    def generate_output(self, input_text, model_generator, on_chunk=None):
+        pending = self.prepare_generation(input_text)
+        accumulator = EntropyCalculator.StreamingEntropy()
+        with get_metrics().span('model_call'):
+            response = self.collect_response(
+                model_generator(pending['prompt']), on_chunk, accumulator
             )
-        else:
-            # Fallback jika tidak ada memori yang relevan
-            prompt = self.create_prompt(input_text, "", 0)
-        
-        response = model_generator(prompt)
-        
+        return self.finalize_generation(input_text, response, pending, accumulator)
+
+    async def agenerate_output(self, input_text, model_generator, on_chunk=None):
+        """Versi async: model_generator mengembalikan coroutine (atau async iterator)"""
+        pending = self.prepare_generation(input_text)
+        accumulator = EntropyCalculator.StreamingEntropy()
+        with get_metrics().span('model_call'):
+            response = model_generator(pending['prompt'])
+            if not hasattr(response, '__aiter__'):
+                response = await response
+            response = await self.acollect_response(response, on_chunk, accumulator)
+        return self.finalize_generation(input_text, response, pending, accumulator)
+
+    def prepare_generation(self, input_text):
+        """Analisis input, fusi memori, dan bangun prompt sebelum model dipanggil"""
+        metrics = get_metrics()
+        # Analisis input
+        with metrics.span('uncertainty'):
+            uncertainty = self.uncertainty_analyzer.analyze_uncertainty(input_text)
+
+        with metrics.span('memory_fusion'):
+            # Aktifkan konteks saat ini di STM
+            current_context = self.create_context(input_text, uncertainty)
+            self.memory.activate_context(current_context)
+
+            # Lakukan fusi memori
+            fused_state = self.memory.pft_fusion_operator()
+
+            if fused_state:
+                emergence_index = self.memory.calculate_emergence_index(fused_state)
+                fused_meaning = fused_state['meaning']
+            else:
+                # Fallback jika tidak ada memori yang relevan
+                emergence_index = 0
+                fused_meaning = ""
+
+        # Bangun prompt dengan pengetahuan emergen
+        with metrics.span('create_prompt'):
+            prompt = self.create_prompt(input_text, fused_meaning, emergence_index)
+
+        return {
+            'context': current_context,
+            'prompt': prompt,
+            'emergence_index': emergence_index
+        }
+
+    def finalize_generation(self, input_text, response, pending, accumulator):
+        """
+        Evaluasi respons, simpan pengalaman, lalu post-analisis: footer
+        emergence dan entropy output (disimpan di pending['output_entropy'])
+        """
+        metrics = get_metrics()
         # Evaluasi dan simpan pengalaman
-        performance = self.evaluate_response(response, input_text)
-        self.memory.store_experience(
-            key=f"exp_{int(time.time())}",
-            experience={
-                'state': current_context['state'],
-                'meaning': current_context['meaning'],
-                'performance': performance
-            }
-        )
-        
-        return response + f"\n\n[Emergence Index: {emergence_index:.2f}]"
+        current_context = pending['context']
+        with metrics.span('evaluate_response'):
+            performance = self.evaluate_response(response, input_text)
+
+        with metrics.span('store_experience'):
+            self.memory.store_experience(
+                key=self.memory.new_key("exp"),
+                experience={
+                    'state': current_context['state'],
+                    'meaning': current_context['meaning'],
+                    'performance': performance
+                }
+            )
+
+        with metrics.span('post_analysis'):
+            footer = f"\n\n[Emergence Index: {pending['emergence_index']:.2f}]"
+            accumulator.update(footer)
+            self.output_entropy = accumulator
+            pending['output_entropy'] = accumulator.entropy()
+        return response + footer
+
+    def collect_response(self, response, on_chunk=None, accumulator=None):
+        """
+        Kumpulkan respons model (string utuh atau iterator potongan streaming)
+        sambil memperbarui entropy output secara inkremental
+        """
+        if accumulator is None:
+            accumulator = self.output_entropy = EntropyCalculator.StreamingEntropy()
+        if isinstance(response, str):
+            response = (response,)
+
+        chunks = []
+        for chunk in response:
+            chunks.append(chunk)
+            accumulator.update(chunk)
+            if on_chunk:
+                on_chunk(chunk, accumulator)
+        return "".join(chunks)
+
+    async def acollect_response(self, response, on_chunk=None, accumulator=None):
+        """Versi async dari collect_response untuk async iterator potongan"""
+        if not hasattr(response, '__aiter__'):
+            return self.collect_response(response, on_chunk, accumulator)
+        if accumulator is None:
+            accumulator = self.output_entropy = EntropyCalculator.StreamingEntropy()
+
+        chunks = []
+        async for chunk in response:
+            chunks.append(chunk)
+            accumulator.update(chunk)
+            if on_chunk:
+                on_chunk(chunk, accumulator)
+        return "".join(chunks)
     
     def create_context(self, input_text, uncertainty):
         """Membuat representasi konteks saat ini"""
@@ -88,11 +170,22 @@ class OutputGenerator:
             f"{base_prompt}"
         )
     
+    def get_role_context(self):
+        """Konteks role: keterbatasan dari kombinasi dimensi yang terpilih"""
+        if self._role_context is None:
+            self._role_context = DimensionAnalyzer(
+                self.cognitive_style,
+                self.processing_style
+            ).get_constraint_description()
+        return self._role_context
+
     def evaluate_response(self, response, input_text):
         """Evaluasi kualitas respons (sederhana)"""
         # Metrik: panjang respons, kesesuaian dengan pertanyaan
-        relevance = 1 - cosine(
-            self.get_embedding(input_text),
-            self.get_embedding(response)
-        )
-        return len(response) * relevance
\ No newline at end of file
+        input_embedding, response_embedding = self.memory.encoder.encode([input_text, response])
+        relevance = EmbeddingProvider.similarity(input_embedding, response_embedding)
+        return len(response) * relevance
+
+    def get_embedding(self, text):
+        """Embedding teks lewat encoder yang sama dengan memori"""
+        return self.memory.get_embedding(text)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+from MProof import ZKPEmulator
+
+# =============================================
+# 📦 BULK VERIFICATION
+# =============================================
+def verify_proof_lines(first_line: int, lines: List[str]) -> Tuple[int, int, int, List[Dict[str, Any]]]:
+    """
+    Verify a chunk of JSONL proof records (runs in a worker process).
+    A record is {"proof", "facts", "conclusion"[, "id"]} or [proof, facts, conclusion];
+    facts may be a mapping or, for merkle proofs, the fact root.
+    Returns (passed, failed, malformed, failures).
+    """
+    passed = failed = malformed = 0
+    failures = []
+    for line_number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        record_id = line_number
+        try:
+            record = json.loads(line)
+            if isinstance(record, list):
+                proof, facts, conclusion = record
+            else:
+                record_id = record.get("id", line_number)
+                proof, facts, conclusion = record["proof"], record["facts"], record["conclusion"]
+            valid = ZKPEmulator.verify_proof(proof, facts, conclusion)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            malformed += 1
+            failures.append({"line": line_number, "id": record_id, "reason": f"malformed: {error!r}"})
+            continue
+        if valid:
+            passed += 1
+        else:
+            failed += 1
+            failures.append({"line": line_number, "id": record_id, "reason": "commitment mismatch"})
+    return passed, failed, malformed, failures
+
+class BulkVerifier:
+    """
+    Streams proof records from JSONL and spreads the SHA-256 recomputation over
+    a process pool in chunks. At most a few chunks are in flight and failures
+    are streamed out (only a sample is kept), so memory stays flat whatever
+    the file size.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 2000, max_samples: int = 10):
+        if workers is not None and workers < 0:
+            raise ValueError(f"workers must be >= 0, got {workers}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+        self.workers = workers  # 0 = verify in the main process
+        self.chunk_size = chunk_size
+        self.max_samples = max_samples
+
+    def run(self, in_stream, failures_out=None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        report = {"records": 0, "passed": 0, "failed": 0, "malformed": 0, "samples": []}
+
+        def collect(result):
+            passed, failed, malformed, failures = result
+            report["passed"] += passed
+            report["failed"] += failed
+            report["malformed"] += malformed
+            report["records"] += passed + failed + malformed
+            for failure in failures:
+                if len(report["samples"]) < self.max_samples:
+                    report["samples"].append(failure)
+                if failures_out is not None:
+                    failures_out.write(json.dumps(failure, ensure_ascii=False) + "\n")
+
+        chunks = iter(lambda: list(islice(in_stream, self.chunk_size)), [])
+        first_line = 1
+        if self.workers == 0:
+            for lines in chunks:
+                collect(verify_proof_lines(first_line, lines))
+                first_line += len(lines)
+        else:
+            max_pending = 2 * (self.workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                pending = deque()
+                for lines in chunks:
+                    pending.append(pool.submit(verify_proof_lines, first_line, lines))
+                    first_line += len(lines)
+                    if len(pending) >= max_pending:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+
+        report["elapsed"] = time.perf_counter() - started
+        report["proofs_per_second"] = report["records"] / report["elapsed"] if report["elapsed"] else 0.0
+        return report
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        lines = [
+            f"✅ passed: {report['passed']:,} | ❌ failed: {report['failed']:,} | "
+            f"⚠️ malformed: {report['malformed']:,}",
+            f"⏱️ {report['records']:,} proofs in {report['elapsed']:.2f}s "
+            f"({report['proofs_per_second']:,.0f} proofs/s)"
+        ]
+        lines += [f"   line {failure['line']} (id {failure['id']}): {failure['reason']}"
+                  for failure in report["samples"]]
+        return "\n".join(lines)
+
+def verify_proof_file(path: str, failures_path: str = None, **options) -> Dict[str, Any]:
+    """Run BulkVerifier over a JSONL file ('-' = stdin), optionally writing failures as JSONL"""
+    in_stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    failures_out = open(failures_path, "w", encoding="utf-8") if failures_path else None
+    try:
+        return BulkVerifier(**options).run(in_stream, failures_out)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if failures_out is not None:
+            failures_out.close()
+
+def _bounded_int(minimum: int):
+    """argparse type: an int that must be >= minimum"""
+    def integer(text: str) -> int:
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be >= {minimum}, got {value}")
+        return value
+    return integer
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-verify ⊕Mind (proof, facts, conclusion) records from JSONL")
+    parser.add_argument("path", help="JSONL file ('-' = stdin)")
+    parser.add_argument("--workers", type=_bounded_int(0), default=None, help="Worker processes (0 = main process)")
+    parser.add_argument("--chunk-size", type=_bounded_int(1), default=2000, help="Records per chunk")
+    parser.add_argument("--failures", help="Write every failure as JSONL to this file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = verify_proof_file(
+        args.path, args.failures, workers=args.workers, chunk_size=args.chunk_size
+    )
+    print(json.dumps(report, ensure_ascii=False) if args.json else BulkVerifier.format_report(report))
+    return 0 if report["failed"] == report["malformed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
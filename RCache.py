@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+
+class ResponseCache:
+    """
+    Cache respons model berbasis konten (hash dari backend, model, parameter
+    generasi, dan prompt final). Dua tingkat: LRU di dalam proses dan SQLite
+    di disk, keduanya dengan TTL dan batas ukuran. Miss serentak untuk key
+    yang sama digabung (single-flight): hanya satu panggilan ke backend.
+    """
+
+    def __init__(self, maxsize=1024, db_path=None, ttl=None, max_entries=100000):
+        self.maxsize = maxsize          # Kapasitas tier LRU in-process
+        self.ttl = ttl                  # Detik; None = tidak kedaluwarsa
+        self.max_entries = max_entries  # Kapasitas tier SQLite
+        self.memory = OrderedDict()     # key -> (respons, waktu simpan)
+        self.counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'bypassed': 0, 'stores': 0, 'coalesced': 0}
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> Future milik thread yang sedang memanggil backend
+        self._async_flights = weakref.WeakKeyDictionary()  # loop -> {key: asyncio.Future}
+
+        self.db = None
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses(created)")
+            self.db.commit()
+            self._disk_entries = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(model_type, model_name, params, prompt):
+        """Hash SHA-256 dari (model_type, model_name, parameter generasi, prompt)"""
+        material = json.dumps(
+            [model_type, model_name, params, prompt],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(material.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key):
+        """Ambil respons dari LRU, lalu SQLite; None jika tidak ada/kedaluwarsa"""
+        with self._lock:
+            response = self._memory_get(key)
+            if response is None and self.db is not None:
+                response = self._disk_get(key)
+            self.counters['hits' if response is not None else 'misses'] += 1
+            return response
+
+    async def aget(self, key):
+        """get() untuk event loop: hit LRU langsung, tier SQLite dibaca di thread executor"""
+        if self.db is not None:
+            with self._lock:
+                response = self._memory_get(key)
+                if response is not None:
+                    self.counters['hits'] += 1
+                    return response
+            return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+        return self.get(key)
+
+    def _memory_get(self, key):
+        entry = self.memory.get(key)
+        if entry is not None:
+            if not self._expired(entry[1]):
+                self.memory.move_to_end(key)
+                return entry[0]
+            del self.memory[key]
+        return None
+
+    def _disk_get(self, key):
+        row = self.db.execute(
+            "SELECT value, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if not self._expired(row[1]):
+            self._remember(key, row[0], row[1])
+            self.counters['disk_hits'] += 1
+            return row[0]
+        self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self.db.commit()
+        self._disk_entries -= 1
+        return None
+
+    def _remember(self, key, value, created):
+        self.memory[key] = (value, created)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def set(self, key, value):
+        with self._lock:
+            created = time.time()
+            self._remember(key, value, created)
+            self.counters['stores'] += 1
+            if self.db is None:
+                return
+
+            replaced = self.db.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                (key, value, created)
+            )
+            if not replaced:
+                self._disk_entries += 1
+            if self._disk_entries > self.max_entries:
+                # Pangkas entri tertua (plus 10% ruang) sekaligus agar tidak tiap insert
+                excess = self._disk_entries - int(self.max_entries * 0.9)
+                self.db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY created LIMIT ?)", (excess,)
+                )
+                self._disk_entries -= excess
+            self.db.commit()
+
+    async def aset(self, key, value):
+        """set() untuk event loop; tulis SQLite di thread executor"""
+        if self.db is None:
+            self.set(key, value)
+        else:
+            await asyncio.get_running_loop().run_in_executor(None, self.set, key, value)
+
+    def purge_expired(self):
+        """Hapus semua entri kedaluwarsa dari kedua tier"""
+        if self.ttl is None:
+            return
+        with self._lock:
+            cutoff = time.time() - self.ttl
+            for key in [k for k, (_, created) in self.memory.items() if created < cutoff]:
+                del self.memory[key]
+            if self.db is not None:
+                removed = self.db.execute(
+                    "DELETE FROM responses WHERE created < ?", (cutoff,)
+                ).rowcount
+                self.db.commit()
+                self._disk_entries -= removed
+
+    def stats(self):
+        lookups = self.counters['hits'] + self.counters['misses']
+        return {
+            **self.counters,
+            'hit_rate': self.counters['hits'] / lookups if lookups else 0.0,
+            'memory_entries': len(self.memory),
+            'disk_entries': self._disk_entries if self.db is not None else 0
+        }
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    # =============================================
+    # 🔁 GENERATOR WRAPPER
+    # =============================================
+    def _land(self, key, flight, response=None, error=None):
+        """Akhiri single-flight sinkron: lepas key lalu bangunkan yang menunggu"""
+        with self._lock:
+            del self._flights[key]
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(response)
+
+    def wrap(self, generator, model_type, model_name, params, bypass=False):
+        """
+        Bungkus callable dari ModelGenerator.setup_generator (sync maupun async).
+        bypass=True melewati cache, mis. untuk sampling non-deterministik.
+        """
+        def key_for(prompt):
+            return self.make_key(model_type, model_name, params, prompt)
+
+        def should_store(response):
+            return not response.startswith("⚠️ API error")
+
+        def tee(key, chunks):
+            # Respons streaming: teruskan potongan, simpan setelah selesai
+            collected = []
+            for chunk in chunks:
+                collected.append(chunk)
+                yield chunk
+            response = "".join(collected)
+            if should_store(response):
+                self.set(key, response)
+
+        if asyncio.iscoroutinefunction(generator):
+            async def cached(prompt):
+                if bypass:
+                    self.counters['bypassed'] += 1
+                    return await generator(prompt)
+                key = key_for(prompt)
+                response = await self.aget(key)
+                if response is not None:
+                    return response
+
+                loop = asyncio.get_running_loop()
+                flights = self._async_flights.setdefault(loop, {})
+                while key in flights:
+                    flight = flights[key]
+                    self.counters['coalesced'] += 1
+                    try:
+                        return await asyncio.shield(flight)
+                    except asyncio.CancelledError:
+                        if not flight.cancelled():
+                            raise  # Pemanggil ini yang dibatalkan
+                        # Pemimpin dibatalkan: coba lagi (mungkin jadi pemimpin baru)
+
+                flight = flights[key] = loop.create_future()
+                flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+                try:
+                    response = await generator(prompt)
+                    if should_store(response):
+                        await self.aset(key, response)
+                except asyncio.CancelledError:
+                    flight.cancel()
+                    raise
+                except BaseException as error:
+                    flight.set_exception(error)
+                    raise
+                else:
+                    flight.set_result(response)
+                finally:
+                    del flights[key]
+                return response
+        else:
+            def cached(prompt):
+                if bypass:
+                    self.counters['bypassed'] += 1
+                    return generator(prompt)
+                key = key_for(prompt)
+                response = self.get(key)
+                if response is not None:
+                    return response
+
+                with self._lock:
+                    flight = self._flights.get(key)
+                    leader = flight is None
+                    if leader:
+                        flight = self._flights[key] = Future()
+                    else:
+                        self.counters['coalesced'] += 1
+                if not leader:
+                    response = flight.result()
+                    # None: pemimpin mendapat respons streaming yang tidak bisa dibagi
+                    return generator(prompt) if response is None else response
+
+                try:
+                    response = generator(prompt)
+                    if isinstance(response, str) and should_store(response):
+                        self.set(key, response)
+                except BaseException as error:
+                    self._land(key, flight, error=error)
+                    raise
+                if not isinstance(response, str):
+                    self._land(key, flight)
+                    return tee(key, response)
+                self._land(key, flight, response)
+                return response
+
+        cached.cache = self
+        if hasattr(generator, "aclose"):
+            cached.aclose = generator.aclose
+        return cached
@@ -1,37 +1,144 @@
-import json
+import copy
 import random
+import zlib
+from itertools import accumulate
+import numpy as np
 
 class RoleSelector:
+    COGNITIVE_STYLES = ['Analytical', 'Emotive']
+    PROCESSING_STYLES = ['Structured', 'Exploratory']
+
     def __init__(self, config):  # Terima config sebagai parameter
         self.config = config
-    
+        self.compile()
+
+    def compile(self):
+        """Susun tabel role dan bobot kumulatif per entropy level (sekali per config)"""
+        self.roles = list(self.config['roles'])
+        self.role_cum_weights = {
+            level: list(accumulate(weights))
+            for level, weights in self.config['role_weights'].items()
+        }
+        self.dimension_cum_weights = {
+            level: (
+                list(accumulate([dims['Analytical'], dims['Emotive']])),
+                list(accumulate([dims['Structured'], dims['Exploratory']]))
+            )
+            for level, dims in self.config['dimension_weights'].items()
+        }
+
     def select_role(self, entropy_level):
         """Pilih role berdasarkan entropy level"""
-        role_weights = self.config['role_weights'][entropy_level]
-        roles = self.config['roles']
-        
-        selected_index = random.choices(
-            range(len(roles)), 
-            weights=role_weights, 
+        return random.choices(
+            self.roles,
+            cum_weights=self.role_cum_weights[entropy_level],
             k=1
         )[0]
-        
-        return roles[selected_index]
-    
+
     def select_dimensions(self, entropy_level):
         """Pilih kombinasi dimensi kognitif"""
-        dim_config = self.config['dimension_weights'][entropy_level]
-        
+        cognitive_weights, processing_weights = self.dimension_cum_weights[entropy_level]
+
         cognitive_style = random.choices(
-            ['Analytical', 'Emotive'],
-            weights=[dim_config['Analytical'], dim_config['Emotive']],
+            self.COGNITIVE_STYLES,
+            cum_weights=cognitive_weights,
             k=1
         )[0]
-        
+
         processing_style = random.choices(
-            ['Structured', 'Exploratory'],
-            weights=[dim_config['Structured'], dim_config['Exploratory']],
+            self.PROCESSING_STYLES,
+            cum_weights=processing_weights,
             k=1
         )[0]
-        
-        return cognitive_style, processing_style
\ No newline at end of file
+
+        return cognitive_style, processing_style
+
+    def select(self, entropy_level):
+        """(role, gaya kognitif, gaya pemrosesan) untuk satu entropy level"""
+        return (self.select_role(entropy_level),) + self.select_dimensions(entropy_level)
+
+class RoleSampler:
+    """
+    Sampler role/dimensi berbasis numpy.random.Generator dengan CDF per entropy
+    level yang dihitung sekali. Satu panggilan sample() menetapkan role dan kedua
+    dimensi untuk seluruh array entropy level; hasil deterministik untuk seed
+    (atau stream sesi) yang sama.
+    """
+
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        self.compile()
+
+    def compile(self):
+        """CDF role (level x role) dan peluang Analytical/Structured per level"""
+        self.levels = list(self.config['role_weights'])
+        self.roles = np.asarray(self.config['roles'])
+        self.cognitive_styles = np.asarray(RoleSelector.COGNITIVE_STYLES)
+        self.processing_styles = np.asarray(RoleSelector.PROCESSING_STYLES)
+
+        weights = np.asarray([self.config['role_weights'][level] for level in self.levels], dtype=np.float64)
+        if weights.shape[1] != len(self.roles):
+            raise ValueError("The number of weights does not match the population")
+        # Baris tanpa bobot positif menghasilkan CDF NaN (sama seperti random.choices: ditolak)
+        self._check_weights(weights, 'role_weights')
+        cdf = np.cumsum(weights, axis=1)
+        cdf /= cdf[:, -1:]
+        cdf[:, -1] = 1.0
+        # CDF semua level dirangkai (level i digeser +i) -> satu searchsorted untuk semua baris
+        self._role_cdf = (cdf + np.arange(len(self.levels))[:, None]).ravel()
+
+        dims = [self.config['dimension_weights'][level] for level in self.levels]
+        for pair in (('Analytical', 'Emotive'), ('Structured', 'Exploratory')):
+            self._check_weights(np.asarray([[d[name] for name in pair] for d in dims], dtype=np.float64),
+                                'dimension_weights')
+        self._p_analytical = np.asarray([d['Analytical'] / (d['Analytical'] + d['Emotive']) for d in dims])
+        self._p_structured = np.asarray([d['Structured'] / (d['Structured'] + d['Exploratory']) for d in dims])
+
+    def _check_weights(self, weights, section):
+        for level, row in zip(self.levels, weights):
+            if not np.isfinite(row).all() or (row < 0).any() or row.sum() <= 0:
+                raise ValueError(f"{section}[{level!r}]: weights must be non-negative with a positive total")
+
+    def stream(self, key):
+        """Sampler turunan deterministik untuk satu sesi/kunci; tabel CDF dipakai bersama"""
+        child = copy.copy(self)
+        child.seed_sequence = np.random.SeedSequence(
+            self.seed_sequence.entropy,
+            spawn_key=self.seed_sequence.spawn_key + (zlib.crc32(str(key).encode('utf-8')),)
+        )
+        child.rng = np.random.default_rng(child.seed_sequence)
+        return child
+
+    def level_codes(self, entropy_levels):
+        """Ubah array entropy level (string atau indeks int) ke indeks level"""
+        levels = np.asarray(entropy_levels)
+        if levels.dtype.kind in 'iu':
+            return levels.astype(np.intp, copy=False)
+        codes = np.full(levels.shape, -1, dtype=np.intp)
+        for code, level in enumerate(self.levels):
+            codes[levels == level] = code
+        if (codes < 0).any():
+            raise KeyError(str(levels[codes < 0][0]))
+        return codes
+
+    def sample_indices(self, entropy_levels):
+        """Indeks (role, gaya kognitif, gaya pemrosesan) untuk setiap entropy level"""
+        codes = self.level_codes(entropy_levels)
+        draws = self.rng.random((len(codes), 3))
+        roles = np.searchsorted(self._role_cdf, draws[:, 0] + codes, side='right') - codes * len(self.roles)
+        np.minimum(roles, len(self.roles) - 1, out=roles)  # u + i dapat membulat ke batas level
+        cognitive = (draws[:, 1] >= self._p_analytical[codes]).astype(np.intp)
+        processing = (draws[:, 2] >= self._p_structured[codes]).astype(np.intp)
+        return roles, cognitive, processing
+
+    def sample(self, entropy_levels):
+        """Array nama (role, gaya kognitif, gaya pemrosesan) untuk semua entropy level"""
+        roles, cognitive, processing = self.sample_indices(entropy_levels)
+        return self.roles[roles], self.cognitive_styles[cognitive], self.processing_styles[processing]
+
+    def select(self, entropy_level):
+        """(role, gaya kognitif, gaya pemrosesan) untuk satu entropy level"""
+        role, cognitive, processing = self.sample_indices([entropy_level])
+        return str(self.roles[role[0]]), str(self.cognitive_styles[cognitive[0]]), str(self.processing_styles[processing[0]])
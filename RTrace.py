@@ -0,0 +1,175 @@
+import json
+import struct
+from collections import deque
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any, Iterator, Tuple
+
+# =============================================
+# 📜 STRUCTURED TRACE
+# =============================================
+class TraceEvent(Enum):
+    """Trace event: (binary code, verbosity level, message template)"""
+    RULE_ADDED = (1, 2, "Added rule: {0}")
+    FACT_ADDED = (2, 2, "Added fact: {0} = {1}")
+    COMPOSED = (3, 1, "⊕ Composed: {0} ⊕ {1} → {2}")
+    RULE_FIRED = (4, 1, "Rule {0} FIRED with confidence: {1:.2f}")
+    BELOW_THRESHOLD = (5, 1, "Rule {0} satisfied but below threshold ({1:.2f} < {2})")
+
+    def __init__(self, code: int, level: int, template: str):
+        self.code = code
+        self.level = level
+        self.template = template
+
+    def format(self, *args) -> str:
+        return self.template.format(*args)
+
+_EVENTS_BY_CODE = {event.code: event for event in TraceEvent}
+
+class _EventSequence(Sequence):
+    """Read API shared by trace buffers and snapshots: items are formatted on access"""
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [event.format(*args) for event, args in list(self.events)[index]]
+        event, args = self.events[index]
+        return event.format(*args)
+
+    def __iter__(self) -> Iterator[str]:
+        for event, args in self.events:
+            yield event.format(*args)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _EventSequence):
+            return list(self.events) == list(other.events)
+        return isinstance(other, (list, tuple)) and list(self) == list(other)
+
+    __hash__ = None
+
+    def dump(self, stream, binary: bool = False):
+        """Write the events as JSONL (text stream) or as a binary log (byte stream)"""
+        writer = TraceWriter(stream, binary)
+        for event, args in self.events:
+            writer.write(event, args)
+
+class TraceView(_EventSequence):
+    """Immutable snapshot of trace events (ReasoningTrace.steps)"""
+
+    def __init__(self, events):
+        self.events = tuple(events)
+
+    def __repr__(self) -> str:
+        return f"TraceView({len(self.events)} events)"
+
+class TraceBuffer(_EventSequence):
+    """
+    Ring buffer of structured trace events: (TraceEvent, args) tuples that are
+    formatted only when read. Events above `verbosity` are not recorded;
+    capacity=None keeps every event. An optional sink (e.g. a TraceWriter)
+    receives each recorded event as it happens, so the full trace can be
+    streamed to disk while memory holds only the newest `capacity` events.
+    """
+
+    OFF = 0
+    INFERENCE = 1  # Rule firings and compositions
+    ALL = 2  # Also every added rule and fact
+
+    def __init__(self, capacity: int = 10000, verbosity: int = ALL, sink: Any = None):
+        self.events = deque(maxlen=capacity)
+        self.verbosity = verbosity
+        self.sink = sink
+        self.recorded = 0
+
+    @property
+    def dropped(self) -> int:
+        """Events pushed out of the ring buffer"""
+        return self.recorded - len(self.events)
+
+    def record(self, event: TraceEvent, *args):
+        if event.level <= self.verbosity:
+            self.events.append((event, args))
+            self.recorded += 1
+            if self.sink is not None:
+                self.sink.write(event, args)
+
+    def clear(self):
+        self.events.clear()
+        self.recorded = 0
+
+    def snapshot(self) -> TraceView:
+        return TraceView(self.events)
+
+    def __repr__(self) -> str:
+        return f"TraceBuffer({len(self.events)}/{self.events.maxlen} events, verbosity={self.verbosity})"
+
+_TRACE_MAGIC = b"OMTRACE1"
+
+class TraceWriter:
+    """
+    Streams trace events as JSONL ({"event", "args"} per line) or as a compact
+    binary log: magic header, then per event a code byte, an argument count
+    byte and tagged arguments (T/F bool, i int64, f float64, N None,
+    s uint32-length UTF-8 string).
+    """
+
+    def __init__(self, stream, binary: bool = False):
+        self.stream = stream
+        self.binary = binary
+        if binary:
+            stream.write(_TRACE_MAGIC)
+
+    def write(self, event: TraceEvent, args: Tuple):
+        if not self.binary:
+            self.stream.write(json.dumps({"event": event.name, "args": list(args)}, ensure_ascii=False) + "\n")
+            return
+        parts = [struct.pack("<BB", event.code, len(args))]
+        for arg in args:
+            if arg is True or arg is False:
+                parts.append(b"T" if arg else b"F")
+            elif arg is None:
+                parts.append(b"N")
+            elif isinstance(arg, int) and -2 ** 63 <= arg < 2 ** 63:
+                parts.append(b"i" + struct.pack("<q", arg))
+            elif isinstance(arg, float):
+                parts.append(b"f" + struct.pack("<d", arg))
+            else:
+                data = str(arg).encode()
+                parts.append(b"s" + struct.pack("<I", len(data)) + data)
+        self.stream.write(b"".join(parts))
+
+def read_trace(stream, binary: bool = False) -> Iterator[Tuple[TraceEvent, Tuple]]:
+    """Read events written by TraceWriter back as (TraceEvent, args)"""
+    if not binary:
+        for line in stream:
+            if line.strip():
+                record = json.loads(line)
+                yield TraceEvent[record["event"]], tuple(record["args"])
+        return
+
+    if stream.read(len(_TRACE_MAGIC)) != _TRACE_MAGIC:
+        raise ValueError("Not a ⊕Mind binary trace")
+    while True:
+        header = stream.read(2)
+        if not header:
+            return
+        code, count = struct.unpack("<BB", header)
+        args = []
+        for _ in range(count):
+            tag = stream.read(1)
+            if tag in (b"T", b"F"):
+                args.append(tag == b"T")
+            elif tag == b"N":
+                args.append(None)
+            elif tag == b"i":
+                args.append(struct.unpack("<q", stream.read(8))[0])
+            elif tag == b"f":
+                args.append(struct.unpack("<d", stream.read(8))[0])
+            elif tag == b"s":
+                length, = struct.unpack("<I", stream.read(4))
+                args.append(stream.read(length).decode())
+            else:
+                raise ValueError(f"Corrupt binary trace (argument tag {tag!r})")
+        yield _EVENTS_BY_CODE[code], tuple(args)
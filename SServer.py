@@ -0,0 +1,237 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from CPipeline import Pipeline
+from HMemory import PFTCognitiveMemory
+from LMetrics import get_metrics
+
+class SessionState:
+    """State per sesi: window PFTFusion, memori kognitif, dan OutputGenerator sendiri"""
+
+    def __init__(self, pipeline, session_id, memory_capacity=None):
+        self.pft_controller = pipeline.new_fusion()
+        self.memory = PFTCognitiveMemory(pipeline.encoder, capacity=memory_capacity)
+        self.selector = pipeline.session_selector(session_id)
+        self.generators = {}  # (role, cognitive, processing) -> OutputGenerator
+        self.last_used = time.time()
+        self.lock = asyncio.Lock()  # Analisis berjalan di thread; window fusi tetap berurutan
+
+class AnalysisService:
+    """
+    Layanan HTTP berbasis asyncio dengan endpoint:
+    - POST /analyze  : entropy, kedalaman kognitif, abstraksi, fusion, risiko collapse, role
+    - POST /generate : analisis + respons model (generator async, dibuat sekali per proses)
+    - GET  /health   : status layanan dan jumlah sesi
+    - GET  /metrics  : histogram latensi per tahap (Prometheus; /metrics.json untuk JSON)
+    Body JSON: {"text": "...", "session_id": "..."}; session_id baru dibuat jika kosong.
+    """
+    MAX_BODY = 1 << 20
+    MAX_HEADERS = 100
+
+    def __init__(self, config, model_generator, max_sessions=10000, session_ttl=3600,
+                 temperature=0.65, window_size=5, memory_capacity=1000, seed=None):
+        self.config = config
+        self.model_generator = model_generator
+        # Pipeline terkompilasi dipakai bersama; generator model async (coroutine)
+        self.pipeline = Pipeline(
+            config, model_generator,
+            temperature=temperature,
+            window_size=window_size,
+            seed=seed  # Ber-seed: tiap sesi memakai stream RoleSampler deterministik
+        )
+        self.sessions = OrderedDict()
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.memory_capacity = memory_capacity
+        self.routes = {
+            ('POST', '/analyze'): self.handle_analyze,
+            ('POST', '/generate'): self.handle_generate,
+            ('GET', '/health'): self.handle_health,
+            ('GET', '/metrics'): self.handle_metrics,
+            ('GET', '/metrics.json'): self.handle_metrics_json
+        }
+
+    # =============================================
+    # 👥 SESSIONS
+    # =============================================
+    def get_session(self, session_id):
+        """Ambil (atau buat) state sesi; sesi paling lama tidak aktif dibuang"""
+        session_id = session_id or uuid.uuid4().hex
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = SessionState(
+                self.pipeline, session_id, self.memory_capacity
+            )
+        self.sessions.move_to_end(session_id)
+        session.last_used = time.time()
+
+        cutoff = session.last_used - self.session_ttl
+        while self.sessions:
+            oldest_id, oldest = next(iter(self.sessions.items()))
+            if len(self.sessions) <= self.max_sessions and oldest.last_used >= cutoff:
+                break
+            del self.sessions[oldest_id]
+        return session_id, session
+
+    # =============================================
+    # 🛣️ HANDLERS
+    # =============================================
+    async def analyze(self, text, session):
+        """pipeline.analyze (CPU-bound) di thread executor agar koneksi lain tetap dilayani"""
+        async with session.lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.pipeline.analyze, text, session.pft_controller, session.selector
+            )
+
+    async def handle_analyze(self, body):
+        text = self._require_text(body)
+        session_id, session = self.get_session(body.get('session_id'))
+        summary = await self.analyze(text, session)
+        return {'session_id': session_id, 'analysis': summary}
+
+    async def handle_generate(self, body):
+        text = self._require_text(body)
+        session_id, session = self.get_session(body.get('session_id'))
+        with get_metrics().span('request'):
+            summary = await self.analyze(text, session)
+            output, output_entropy = await self.pipeline.agenerate(
+                text, summary,
+                memory=session.memory,
+                generators=session.generators
+            )
+        return {
+            'session_id': session_id,
+            'analysis': summary,
+            'output': output,
+            'post_analysis': {'output_entropy': output_entropy}
+        }
+
+    async def handle_health(self, body):
+        return {'status': 'ok', 'sessions': len(self.sessions)}
+
+    async def handle_metrics(self, body):
+        return get_metrics().to_prometheus()
+
+    async def handle_metrics_json(self, body):
+        return {'enabled': get_metrics().enabled, 'stages': get_metrics().snapshot()}
+
+    @staticmethod
+    def _require_text(body):
+        text = body.get('text')
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("Field 'text' wajib diisi")
+        return text
+
+    # =============================================
+    # 🌐 HTTP/1.1 (keep-alive)
+    # =============================================
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):  # Melebihi batas StreamReader
+                    await self._respond(writer, 400, {'error': 'Request line too long'}, close=True)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'Bad request'}, close=True)
+                    break
+
+                headers = {}
+                try:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        if len(headers) >= self.MAX_HEADERS:
+                            raise ValueError("too many header fields")
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._respond(writer, 431, {'error': 'Request header fields too large'}, close=True)
+                    break
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {'error': 'Invalid Content-Length'}, close=True)
+                    break
+                if length > self.MAX_BODY:
+                    await self._respond(writer, 413, {'error': 'Payload too large'}, close=True)
+                    break
+                raw = await reader.readexactly(length) if length else b''
+                close = headers.get('connection', '').lower() == 'close'
+
+                status, payload = await self.dispatch(method, path.split('?', 1)[0], raw)
+                await self._respond(writer, status, payload, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, raw):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known_path = any(route_path == path for _, route_path in self.routes)
+            return (405, {'error': 'Method not allowed'}) if known_path else (404, {'error': 'Not found'})
+        try:
+            body = json.loads(raw) if raw else {}
+            if not isinstance(body, dict):
+                raise ValueError("Body harus berupa objek JSON")
+            return 200, await handler(body)
+        except ValueError as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': str(error)}
+
+    @staticmethod
+    async def _respond(writer, status, payload, close=False):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                   405: 'Method Not Allowed', 413: 'Payload Too Large',
+                   431: 'Request Header Fields Too Large', 500: 'Internal Server Error'}
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), "text/plain; version=0.0.4"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = "application/json"
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        ).encode('latin-1')
+        writer.write(head + body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        """Tutup sumber daya generator model (mis. session HTTP) milik loop ini"""
+        aclose = getattr(self.model_generator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+def run_server(config, model_generator, host="127.0.0.1", port=8080, **options):
+    """Jalankan layanan sampai dihentikan (Ctrl+C)"""
+    service = AnalysisService(config, model_generator, **options)
+    print(f"🌐 Serving on http://{host}:{port} (/analyze, /generate, /health, /metrics)")
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n👋 Server dihentikan.")
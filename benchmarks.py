@@ -0,0 +1,395 @@
+"""
+Microbenchmark suite dengan baseline JSON untuk mendeteksi regresi performa.
+
+    python benchmarks.py run --out baseline.json            # suite lengkap
+    python benchmarks.py run --quick --only entropy         # subset, ukuran kecil
+    python benchmarks.py compare baseline.json current.json --threshold 0.15
+    python benchmarks.py run --quick --baseline baseline.json  # run + compare
+
+compare keluar dengan kode 1 jika ada benchmark yang melambat melebihi threshold.
+"""
+
+import argparse
+import fnmatch
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+from CEngine import CompactReasoningEngine
+from CPipeline import Pipeline
+from ECalculator import EntropyCalculator
+from HMemory import PFTCognitiveMemory
+from OEngine import LogicOperator, LogicRule, OPlusReasoningEngine
+
+# =============================================
+# 📋 REGISTRY
+# =============================================
+BENCHMARKS = {}  # nama -> (setup(size) -> callable, sizes, quick_sizes)
+
+def benchmark(name, sizes, quick_sizes=None):
+    """Daftarkan benchmark; setup(size) menyiapkan data dan mengembalikan fungsi yang diukur"""
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, tuple(sizes), tuple(quick_sizes or sizes))
+        return setup
+    return decorator
+
+def _load_config(path="config.json"):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def _sample_text(size, seed=0):
+    """Teks campuran Indonesia/Inggris sepanjang size byte (deterministik)"""
+    words = (
+        "apa bagaimana mengapa sistem analisis konsep teori filosofi makna data "
+        "contoh kasus spesifik entropy kompleksitas abstrak konkret the of and "
+        "model memori fusi ⊕ kognitif? struktur eksplorasi"
+    ).split()
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word.encode("utf-8")) + 1
+    return " ".join(parts).encode("utf-8")[:size].decode("utf-8", "ignore")
+
+# =============================================
+# 🔢 ENTROPY
+# =============================================
+TEXT_SIZES = (100, 10_000, 1_000_000, 10_000_000)
+QUICK_TEXT_SIZES = (100, 10_000, 1_000_000)
+
+@benchmark("entropy.calculate_text_entropy", TEXT_SIZES, QUICK_TEXT_SIZES)
+def bench_text_entropy(size):
+    text = _sample_text(size)
+    return lambda: EntropyCalculator.calculate_text_entropy(text)
+
+@benchmark("entropy.score_complexity", TEXT_SIZES, QUICK_TEXT_SIZES)
+def bench_score_complexity(size):
+    EntropyCalculator.configure_lexicons(_load_config())
+    text = _sample_text(size)
+    return lambda: EntropyCalculator.score_complexity(text)
+
+@benchmark("entropy.streaming", TEXT_SIZES, QUICK_TEXT_SIZES)
+def bench_streaming_entropy(size):
+    text = _sample_text(size)
+    chunks = [text[i:i + 4096] for i in range(0, len(text), 4096)]
+
+    def run():
+        accumulator = EntropyCalculator.StreamingEntropy()
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator.entropy()
+    return run
+
+@benchmark("entropy.analyze_batch", (100, 10_000, 1_000_000, 10_000_000), (100, 10_000, 1_000_000))
+def bench_analyze_batch(size):
+    """size = total byte; dipecah menjadi teks ~200 byte"""
+    EntropyCalculator.configure_lexicons(_load_config())
+    texts = [_sample_text(200, seed) for seed in range(max(1, size // 200))]
+    return lambda: EntropyCalculator.analyze_batch(texts)
+
+# =============================================
+# 🔥 PFT FUSION
+# =============================================
+@benchmark("pft_fusion.fuse", (5, 50, 500), (5, 50))
+def bench_fuse(window_size):
+    """1000 panggilan fuse per iterasi untuk window_size tertentu"""
+    rng = np.random.default_rng(0)
+    pairs = rng.random((1000, 2)).tolist()
+    fusion = EntropyCalculator.PFTFusion(temperature=0.65, window_size=window_size)
+
+    def run():
+        for a, b in pairs:
+            fusion.fuse(a, b)
+    return run
+
+@benchmark("pft_fusion.fuse_many", (1_000, 100_000, 1_000_000), (1_000, 100_000))
+def bench_fuse_many(size):
+    rng = np.random.default_rng(0)
+    a, b = rng.random(size), rng.random(size)
+    return lambda: EntropyCalculator.PFTFusion(temperature=0.65, window_size=5).fuse_many(a, b)
+
+# =============================================
+# 🧠 MEMORY
+# =============================================
+MEMORY_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_MEMORY_SIZES = (1_000, 10_000)
+
+def _filled_memory(size):
+    memory = PFTCognitiveMemory()
+    for i in range(size):
+        # 1000 makna berulang -> embedding diambil dari cache encoder
+        memory.store_experience(f"exp_{i}", {
+            'state': [i % 97, i % 13, i % 7],
+            'meaning': f"makna pengalaman {i % 1000}",
+            'performance': (i % 100) / 10
+        })
+    return memory
+
+@benchmark("memory.store_experience", MEMORY_SIZES, QUICK_MEMORY_SIZES)
+def bench_memory_store(size):
+    memory = _filled_memory(size)
+    counter = iter(range(size, sys.maxsize))
+
+    def run():
+        i = next(counter)
+        memory.store_experience(f"exp_{i}", {
+            'state': [i % 97, i % 13, i % 7],
+            'meaning': f"makna pengalaman {i % 1000}",
+            'performance': 1.0
+        })
+    return run
+
+@benchmark("memory.find_top_k", MEMORY_SIZES, QUICK_MEMORY_SIZES)
+def bench_memory_lookup(size):
+    memory = _filled_memory(size)
+    return lambda: memory.find_top_k(5, "makna pengalaman 42")
+
+# =============================================
+# ⊕ REASONING
+# =============================================
+RULE_SIZES = (10, 100, 1_000, 10_000, 100_000)
+QUICK_RULE_SIZES = (10, 100, 1_000, 10_000)
+
+@benchmark("reasoning.reason", RULE_SIZES, QUICK_RULE_SIZES)
+def bench_reason(size, mode="sequential", engine_class=OPlusReasoningEngine):
+    """Rantai rule: r_i membutuhkan f_i (dan konklusi r_{i-1}) -> f_{i+1}"""
+    engine = engine_class(confidence_threshold=0.5)
+    for i in range(0, size, 2):
+        engine.add_fact(f"f_{i}", True)
+    for i in range(size):
+        conditions = [f"f_{i}"] + ([f"f_{i - 1}"] if i % 3 == 0 and i else [])
+        engine.add_rule(LogicRule(f"r_{i}", conditions, f"f_{i + 1}", LogicOperator.IMPLIES, 0.9))
+
+    def run():
+        engine.trace.clear()
+        engine.inferred_facts.clear()
+        return engine.reason(mode=mode)
+    return run
+
+@benchmark("reasoning.reason_forward", RULE_SIZES, QUICK_RULE_SIZES)
+def bench_reason_forward(size):
+    return bench_reason(size, mode="forward")
+
+@benchmark("reasoning.reason_compact", RULE_SIZES, QUICK_RULE_SIZES)
+def bench_reason_compact(size):
+    return bench_reason(size, mode="forward", engine_class=CompactReasoningEngine)
+
+@benchmark("reasoning.compose_many", (100, 1_000, 10_000), (100, 1_000))
+def bench_compose_many(size):
+    """size pasangan ⊕ (size/5 berbeda, sisanya dipakai ulang lewat hash-consing)"""
+    def run():
+        engine = OPlusReasoningEngine()
+        for i in range(size):
+            engine.add_rule(LogicRule(f"r_{i}", [f"f_{i}", f"f_{i + 1}"], f"g_{i}", LogicOperator.AND))
+        distinct = max(size // 5, 1)
+        return engine.compose_many([(f"r_{i % distinct}", f"r_{(7 * i) % distinct}") for i in range(size)])
+    return run
+
+@benchmark("reasoning.reprove", (1_000, 10_000, 100_000), (1_000, 10_000))
+def bench_reprove(size):
+    """Ubah satu fakta lalu reason ulang; komitmen Merkle fakta diperbarui inkremental"""
+    engine = OPlusReasoningEngine()
+    for i in range(size):
+        engine.add_fact(f"f_{i}", i % 2 == 0)
+    engine.reason()
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        i = next(counter)
+        engine.add_fact(f"f_{i % size}", i % 3 == 0)
+        engine.trace.clear()
+        return engine.reason()
+    return run
+
+def _rule_chain(size):
+    return [LogicRule(f"r_{i}", [f"f_{i}", f"f_{(7 * i) % size}"], f"f_{i + 1}", LogicOperator.AND, 0.9)
+            for i in range(size)]
+
+@benchmark("reasoning.restore", (1_000, 100_000, 500_000), (1_000, 100_000))
+def bench_restore(size):
+    """Cold start dari snapshot biner (memory-mapped) lalu satu kali reason"""
+    engine = CompactReasoningEngine()
+    engine.add_rules(_rule_chain(size))
+    engine.add_fact("f_0", True)
+    directory = tempfile.TemporaryDirectory()  # Dihapus saat closure dibuang
+    engine.snapshot(directory.name)
+
+    def run():
+        restored = CompactReasoningEngine.restore(directory.name)
+        return directory, restored.reason(mode="forward")
+    return run
+
+@benchmark("reasoning.load_jsonl", (1_000, 10_000, 100_000), (1_000, 10_000))
+def bench_load_jsonl(size):
+    """Muat basis pengetahuan JSONL secara streaming ke CompactReasoningEngine"""
+    engine = OPlusReasoningEngine()
+    engine.add_rules(_rule_chain(size))
+    buffer = io.StringIO()
+    engine.dump_jsonl(buffer)
+    text = buffer.getvalue()
+
+    def run():
+        return CompactReasoningEngine().load_jsonl(io.StringIO(text))
+    return run
+
+# =============================================
+# 🚀 END-TO-END
+# =============================================
+@benchmark("end_to_end.process", (100, 1_000, 10_000), (100, 1_000))
+def bench_end_to_end(size):
+    """Pipeline.process dengan generator echo; size = panjang prompt (byte)"""
+    # LTM dibatasi agar waktu per panggilan tidak bergantung pada jumlah loop
+    pipeline = Pipeline(
+        _load_config(), lambda prompt: f"ECHO: {prompt}",
+        memory=PFTCognitiveMemory(capacity=1000), seed=0
+    )
+    prompts = [_sample_text(size, seed) for seed in range(16)]
+    counter = iter(range(sys.maxsize))
+    return lambda: pipeline.process(prompts[next(counter) % len(prompts)])
+
+# =============================================
+# ⏱️ RUNNER
+# =============================================
+def measure(function, repeat=5, min_time=0.2):
+    """
+    Kalibrasi jumlah loop agar satu repeat >= min_time/repeat, lalu ukur.
+    Mengembalikan detik per panggilan (median dan minimum antar repeat).
+    Panggilan yang sudah >= 1 detik diulang paling banyak 3 kali.
+    """
+    budget = min_time / repeat
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= budget or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(budget / elapsed) + 1))
+    if elapsed / loops >= 1.0:
+        repeat = min(repeat, 3)
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - started) / loops)
+    return {
+        'seconds': statistics.median(samples),
+        'min': min(samples),
+        'loops': loops,
+        'repeat': repeat
+    }
+
+def run_suite(only=None, quick=False, repeat=5, min_time=0.2, log=sys.stderr):
+    results = {}
+    patterns = only or ["*"]
+    for name, (setup, sizes, quick_sizes) in BENCHMARKS.items():
+        if not any(fnmatch.fnmatch(name, p) or name.startswith(p) for p in patterns):
+            continue
+        for size in quick_sizes if quick else sizes:
+            key = f"{name}[{size}]"
+            started = time.perf_counter()
+            function = setup(size)
+            setup_seconds = time.perf_counter() - started
+            result = measure(function, repeat=repeat, min_time=min_time)
+            result.update({'benchmark': name, 'size': size, 'setup_seconds': setup_seconds})
+            results[key] = result
+            print(f"{key:<45} {_format_seconds(result['seconds']):>12}  (setup {setup_seconds:.2f}s)", file=log)
+    return {
+        'meta': {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': quick
+        },
+        'results': results
+    }
+
+def compare(baseline, current, threshold=0.10):
+    """Bandingkan median detik per panggilan; regresi jika current > baseline * (1 + threshold)"""
+    rows = []
+    for key in sorted(set(baseline['results']) & set(current['results'])):
+        before = baseline['results'][key]['seconds']
+        after = current['results'][key]['seconds']
+        ratio = after / before if before else float('inf')
+        status = "REGRESSION" if ratio > 1 + threshold else ("faster" if ratio < 1 - threshold else "ok")
+        rows.append({'benchmark': key, 'baseline': before, 'current': after, 'ratio': ratio, 'status': status})
+    return {
+        'rows': rows,
+        'regressions': [row['benchmark'] for row in rows if row['status'] == "REGRESSION"],
+        'missing': sorted(set(baseline['results']) - set(current['results'])),
+        'new': sorted(set(current['results']) - set(baseline['results']))
+    }
+
+def print_comparison(report, threshold, out=sys.stdout):
+    print(f"{'benchmark':<45} {'baseline':>12} {'current':>12} {'ratio':>7}  status", file=out)
+    for row in report['rows']:
+        print(
+            f"{row['benchmark']:<45} {_format_seconds(row['baseline']):>12} "
+            f"{_format_seconds(row['current']):>12} {row['ratio']:>7.2f}  {row['status']}",
+            file=out
+        )
+    if report['missing']:
+        print(f"\n{len(report['missing'])} benchmark baseline tidak ada di hasil saat ini", file=out)
+    count = len(report['regressions'])
+    print(f"\n{count} regresi (threshold {threshold:.0%})", file=out)
+
+def _format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmark suite didactic-train")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Jalankan benchmark dan tulis hasil JSON")
+    run.add_argument("--out", help="File JSON hasil (default: stdout)")
+    run.add_argument("--only", nargs="*", help="Prefix/pola nama benchmark, mis. entropy memory.*")
+    run.add_argument("--quick", action="store_true", help="Ukuran input kecil saja")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--min-time", type=float, default=0.2, help="Detik minimum per benchmark")
+    run.add_argument("--baseline", help="Bandingkan langsung dengan baseline ini")
+    run.add_argument("--threshold", type=float, default=0.10)
+
+    compare_parser = commands.add_parser("compare", help="Bandingkan dua file hasil")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Perlambatan relatif yang ditoleransi (0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        current = run_suite(args.only, args.quick, args.repeat, args.min_time)
+        output = json.dumps(current, indent=2)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        elif not args.baseline:
+            print(output)
+        if not args.baseline:
+            return 0
+        baseline = _load_json(args.baseline)
+    else:
+        baseline, current = _load_json(args.baseline), _load_json(args.current)
+
+    report = compare(baseline, current, args.threshold)
+    print_comparison(report, args.threshold)
+    return 1 if report['regressions'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
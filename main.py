@@ -1,44 +1,106 @@
 from ECalculator import EntropyCalculator
-from RSelector import RoleSelector
-from OGenerator import OutputGenerator
-import google.generativeai as genai
+from HMemory import PFTCognitiveMemory
+from CPipeline import Pipeline
+from MStore import MemoryStore
+from RCache import ResponseCache
+from LMetrics import get_metrics
+from BExecutor import BatchingExecutor
+from BRunner import run_batch
+from SServer import run_server
+import argparse
+import asyncio
 import json
 import os
+import sys
+import weakref
 import numpy as np
 
 # ===================================================
 # MODEL INTEGRATION BRIDGE (Fully Modular)
 # ===================================================
 class ModelGenerator:
+    # Batas permintaan paralel default per backend (mode async)
+    DEFAULT_CONCURRENCY = {
+        "gemini": 16,
+        "openai": 16,
+        "transformers": 1,
+        "rest_api": 64,
+        "echo": 1024
+    }
+
+    # Model bawaan bila config tidak menyebut model_name (ikut menentukan key cache respons)
+    DEFAULT_MODELS = {
+        "gemini": "gemini-1.5-flash",
+        "openai": "gpt-4-turbo",
+        "transformers": "gpt2"
+    }
+
+    # Parameter generasi per backend (ikut menentukan key cache respons)
+    GENERATION_PARAMS = {
+        "openai": {"max_tokens": 600, "temperature": 0.5},
+        "transformers": {"max_length": 300, "num_return_sequences": 1, "temperature": 0.7}
+    }
+
     @staticmethod
-    def setup_generator(model_type, **kwargs):
+    def setup_generator(model_type, async_mode=False, **kwargs):
         """Factory method untuk membuat model generator"""
+        cache = kwargs.pop("cache", None)
+        if cache is not None:
+            generator = ModelGenerator.setup_generator(model_type, async_mode, **kwargs)
+            return ModelGenerator.with_cache(generator, cache, model_type, **kwargs)
+
+        if async_mode:
+            return ModelGenerator.setup_async_generator(model_type, **kwargs)
+
         if model_type == "gemini":
             return ModelGenerator.create_gemini_generator(
                 kwargs.get("api_key"),
-                kwargs.get("model_name", "gemini-1.5-flash")
+                kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS["gemini"])
             )
         elif model_type == "openai":
             return ModelGenerator.create_openai_generator(
                 kwargs.get("api_key"),
-                kwargs.get("model_name", "gpt-4-turbo")
+                kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS["openai"])
             )
         elif model_type == "transformers":
             return ModelGenerator.create_transformers_generator(
-                kwargs.get("model_name", "gpt2"),
-                kwargs.get("device", -1)
+                kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS["transformers"]),
+                kwargs.get("device", -1),
+                **ModelGenerator.batching_options(kwargs)
             )
         elif model_type == "rest_api":
             return ModelGenerator.create_restapi_generator(
                 kwargs.get("api_url"),
                 kwargs.get("headers", {}),
-                kwargs.get("payload_template", {"prompt": "{prompt}"})
+                kwargs.get("payload_template", {"prompt": "{prompt}"}),
+                **ModelGenerator.http_options(kwargs)
             )
         elif model_type == "echo":
             return lambda prompt: f"ECHO: {prompt}"
         else:
             raise ValueError(f"Unsupported model type: {model_type}")
 
+    @staticmethod
+    def with_cache(generator, cache, model_type, **kwargs):
+        """
+        Pasang ResponseCache di depan generator; key = (backend, model, parameter, prompt).
+        Model bawaan di-resolve dulu, dan untuk REST semua header ikut di-hash
+        karena header (mis. token tenant atau pemilih model) dapat mengubah respons.
+        """
+        if model_type == "rest_api":
+            model_name = kwargs.get("api_url")
+            params = {
+                "payload_template": kwargs.get("payload_template", {"prompt": "{prompt}"}),
+                "headers": kwargs.get("headers", {})
+            }
+        else:
+            model_name = kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS.get(model_type))
+            params = ModelGenerator.GENERATION_PARAMS.get(model_type, {})
+        return cache.wrap(
+            generator, model_type, model_name, params,
+            bypass=kwargs.get("cache_bypass", False)
+        )
+
     @staticmethod
     def create_gemini_generator(api_key, model_name):
         import google.generativeai as genai
@@ -65,15 +127,28 @@ class ModelGenerator:
             response = client.chat.completions.create(
                 model=model_name,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=600,
-                temperature=0.5
+                **ModelGenerator.GENERATION_PARAMS["openai"]
             )
             return response.choices[0].message.content.strip()
         return generator
 
     @staticmethod
-    def create_transformers_generator(model_name, device):
+    def batching_options(kwargs):
+        """Opsi micro-batching backend transformers beserta nilai default"""
+        return {
+            "batch_size": kwargs.get("batch_size", 1),
+            "max_wait_ms": kwargs.get("max_wait_ms", 10),
+            "num_threads": kwargs.get("num_threads")
+        }
+
+    @staticmethod
+    def create_transformers_generator(model_name, device, batch_size=1,
+                                      max_wait_ms=10, num_threads=None):
         from transformers import pipeline
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+
         generator = pipeline(
             "text-generation",
             model=model_name,
@@ -83,46 +158,281 @@ class ModelGenerator:
         def generate_func(prompt):
             output = generator(
                 prompt,
-                max_length=300,
-                num_return_sequences=1,
-                temperature=0.7
+                **ModelGenerator.GENERATION_PARAMS["transformers"]
             )
             return output[0]['generated_text'].strip()
-        return generate_func
+
+        if batch_size <= 1:
+            return generate_func
+
+        # Model decoder-only butuh padding kiri dan token pad untuk batch
+        tokenizer = generator.tokenizer
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token_id = generator.model.config.eos_token_id
+
+        def generate_batch(prompts):
+            outputs = generator(
+                prompts,
+                batch_size=len(prompts),
+                **ModelGenerator.GENERATION_PARAMS["transformers"]
+            )
+            return [output[0]['generated_text'].strip() for output in outputs]
+
+        return BatchingExecutor(generate_batch, batch_size, max_wait_ms)
+
+    # =============================================
+    # 🌐 HTTP CLIENT (REST API)
+    # =============================================
+    # Status yang layak dicoba ulang dengan exponential backoff
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
 
     @staticmethod
-    def create_restapi_generator(api_url, headers, payload_template):
+    def http_options(kwargs):
+        """Opsi pool/timeout/retry untuk backend rest_api beserta nilai default"""
+        return {
+            "connect_timeout": kwargs.get("connect_timeout", 5.0),
+            "read_timeout": kwargs.get("read_timeout", 60.0),
+            "max_retries": kwargs.get("max_retries", 3),
+            "backoff_factor": kwargs.get("backoff_factor", 0.5),
+            "pool_size": kwargs.get("pool_size", 10),
+            "stream": kwargs.get("stream", False)
+        }
+
+    @staticmethod
+    def create_http_session(pool_size=10, max_retries=3, backoff_factor=0.5):
+        """Session requests dengan pool koneksi keep-alive dan retry terbatas"""
         import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=ModelGenerator.RETRY_STATUSES,
+            allowed_methods=None,  # POST ikut dicoba ulang
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
-        def generator(prompt):
-            payload = {}
-            for key, value in payload_template.items():
-                if isinstance(value, str):
-                    payload[key] = value.format(prompt=prompt)
-                else:
-                    payload[key] = value
+    @staticmethod
+    def build_payload(payload_template, prompt):
+        payload = {}
+        for key, value in payload_template.items():
+            if isinstance(value, str):
+                payload[key] = value.format(prompt=prompt)
+            else:
+                payload[key] = value
+        return payload
 
-            response = requests.post(
+    @staticmethod
+    def create_restapi_generator(api_url, headers, payload_template,
+                                 connect_timeout=5.0, read_timeout=60.0,
+                                 max_retries=3, backoff_factor=0.5,
+                                 pool_size=10, stream=False):
+        session = ModelGenerator.create_http_session(pool_size, max_retries, backoff_factor)
+        session.headers.update(headers)
+        timeout = (connect_timeout, read_timeout)
+
+        def read_stream(response):
+            # Potongan dialirkan ke pemanggil (mis. StreamingEntropy) saat tiba
+            with response:
+                for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                    if chunk:
+                        yield chunk
+
+        def generator(prompt):
+            response = session.post(
                 api_url,
-                headers=headers,
-                json=payload
+                json=ModelGenerator.build_payload(payload_template, prompt),
+                timeout=timeout,
+                stream=stream
             )
 
             if response.status_code != 200:
                 return f"⚠️ API error: {response.status_code} - {response.text}"
 
+            if stream:
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                return read_stream(response)
             return response.text
+
+        generator.session = session
+        return generator
+
+    # =============================================
+    # ⚡ ASYNC GENERATORS
+    # =============================================
+    @staticmethod
+    def setup_async_generator(model_type, **kwargs):
+        """Factory async: generator mengembalikan coroutine, dibatasi semaphore per backend"""
+        default_concurrency = ModelGenerator.DEFAULT_CONCURRENCY.get(model_type, 16)
+        if model_type == "transformers":
+            # Beri ruang agar micro-batch bisa terisi penuh
+            default_concurrency = 2 * kwargs.get("batch_size", 1)
+        max_concurrency = kwargs.get("max_concurrency", default_concurrency)
+
+        if model_type == "gemini":
+            generator = ModelGenerator.create_async_gemini_generator(
+                kwargs.get("api_key"),
+                kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS["gemini"])
+            )
+        elif model_type == "openai":
+            generator = ModelGenerator.create_async_openai_generator(
+                kwargs.get("api_key"),
+                kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS["openai"])
+            )
+        elif model_type == "transformers":
+            generator = ModelGenerator.create_async_transformers_generator(
+                kwargs.get("model_name", ModelGenerator.DEFAULT_MODELS["transformers"]),
+                kwargs.get("device", -1),
+                **ModelGenerator.batching_options(kwargs)
+            )
+        elif model_type == "rest_api":
+            options = ModelGenerator.http_options(kwargs)
+            options.pop("stream")
+            generator = ModelGenerator.create_async_restapi_generator(
+                kwargs.get("api_url"),
+                kwargs.get("headers", {}),
+                kwargs.get("payload_template", {"prompt": "{prompt}"}),
+                **options
+            )
+        elif model_type == "echo":
+            async def generator(prompt):
+                return f"ECHO: {prompt}"
+        else:
+            raise ValueError(f"Unsupported model type: {model_type}")
+
+        return ModelGenerator.bounded(generator, max_concurrency)
+
+    @staticmethod
+    def bounded(async_generator, max_concurrency):
+        """Bungkus generator async dengan semaphore; satu semaphore per event loop"""
+        semaphores = weakref.WeakKeyDictionary()  # loop -> Semaphore
+
+        async def generator(prompt):
+            loop = asyncio.get_running_loop()
+            semaphore = semaphores.get(loop)
+            if semaphore is None:
+                semaphore = semaphores[loop] = asyncio.Semaphore(max_concurrency)
+            async with semaphore:
+                return await async_generator(prompt)
+
+        generator.max_concurrency = max_concurrency
+        if hasattr(async_generator, "aclose"):
+            generator.aclose = async_generator.aclose
+        return generator
+
+    @staticmethod
+    def create_async_gemini_generator(api_key, model_name):
+        import google.generativeai as genai
+        if not api_key:
+            raise ValueError("Gemini API key not provided")
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name)
+
+        async def generator(prompt):
+            response = await model.generate_content_async(prompt)
+            if response.candidates and response.candidates[0].content.parts:
+                return response.candidates[0].content.parts[0].text.strip()
+            return "Maaf, tidak dapat menghasilkan respons."
+        return generator
+
+    @staticmethod
+    def create_async_openai_generator(api_key, model_name):
+        from openai import AsyncOpenAI
+        if not api_key:
+            raise ValueError("OpenAI API key not provided")
+        client = AsyncOpenAI(api_key=api_key)
+
+        async def generator(prompt):
+            response = await client.chat.completions.create(
+                model=model_name,
+                messages=[{"role": "user", "content": prompt}],
+                **ModelGenerator.GENERATION_PARAMS["openai"]
+            )
+            return response.choices[0].message.content.strip()
+        return generator
+
+    @staticmethod
+    def create_async_transformers_generator(model_name, device, batch_size=1,
+                                            max_wait_ms=10, num_threads=None):
+        generate_func = ModelGenerator.create_transformers_generator(
+            model_name, device, batch_size, max_wait_ms, num_threads
+        )
+        if isinstance(generate_func, BatchingExecutor):
+            return generate_func.asubmit
+
+        # Pipeline lokal bersifat blocking; jalankan di thread executor
+
+        async def generator(prompt):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, generate_func, prompt)
+        return generator
+
+    @staticmethod
+    def create_async_restapi_generator(api_url, headers, payload_template,
+                                       connect_timeout=5.0, read_timeout=60.0,
+                                       max_retries=3, backoff_factor=0.5,
+                                       pool_size=10):
+        import aiohttp
+        sessions = weakref.WeakKeyDictionary()  # loop -> ClientSession (terikat ke loop-nya)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+
+        async def generator(prompt):
+            loop = asyncio.get_running_loop()
+            session = sessions.get(loop)
+            if session is None or session.closed:
+                session = sessions[loop] = aiohttp.ClientSession(
+                    headers=headers,
+                    timeout=timeout,
+                    connector=aiohttp.TCPConnector(limit=pool_size)
+                )
+
+            payload = ModelGenerator.build_payload(payload_template, prompt)
+            for attempt in range(max_retries + 1):
+                last_attempt = attempt == max_retries
+                try:
+                    async with session.post(api_url, json=payload) as response:
+                        text = await response.text()
+                        status = response.status
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if last_attempt:
+                        raise
+                else:
+                    if status == 200:
+                        return text
+                    if last_attempt or status not in ModelGenerator.RETRY_STATUSES:
+                        return f"⚠️ API error: {status} - {text}"
+                await asyncio.sleep(backoff_factor * (2 ** attempt))
+
+        async def aclose():
+            """Tutup session milik event loop yang sedang berjalan"""
+            session = sessions.pop(asyncio.get_running_loop(), None)
+            if session is not None:
+                await session.close()
+
+        generator.aclose = aclose
         return generator
 
 # ===================================================
 # MAIN APPLICATION
 # ===================================================
-def load_config():
+def load_config(path='config.json'):
     try:
-        with open('config.json') as f:
+        with open(path) as f:
             return json.load(f)
     except:
-        print("⚠️ Using default configuration")
+        print("⚠️ Using default configuration", file=sys.stderr)  # stdout bisa berisi output JSONL
         return {
             "roles": ["Assistance"],
             "role_weights": {"low": [1], "medium": [1], "high": [1]},
@@ -176,6 +486,7 @@ def get_model_config(model_type):
     elif model_type == "transformers":
         config["model_name"] = input("Model name [gpt2]: ").strip() or "gpt2"
         config["device"] = int(input("Device (-1=CPU, 0=GPU) [-1]: ").strip() or -1)
+        config["batch_size"] = int(input("Batch size [1]: ").strip() or 1)
 
     elif model_type == "rest_api":
         config["api_url"] = input("Masukkan API URL: ").strip()
@@ -194,13 +505,108 @@ def get_model_config(model_type):
 
     return config
 
-def main():
-    config = load_config()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="didactic-train",
+        description="Framework Entropy-Utility Modular"
+    )
+    parser.add_argument("--config", default="config.json", help="Path config.json")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Aktifkan histogram latensi per tahap (juga lewat \"metrics\": true di config)")
+    commands = parser.add_subparsers(dest="command")
+
+    batch = commands.add_parser("batch", help="Proses korpus prompt JSONL secara non-interaktif")
+    batch.add_argument("--in", dest="in_path", required=True, help="File JSONL input ('-' = stdin)")
+    batch.add_argument("--out", dest="out_path", required=True, help="File JSONL output ('-' = stdout)")
+    batch.add_argument("--workers", type=int, default=None,
+                       help="Jumlah proses analisis (default: jumlah CPU, 0 = tanpa process pool)")
+    batch.add_argument("--chunk-size", type=int, default=256, help="Record per chunk analisis")
+    batch.add_argument("--concurrency", type=int, default=8, help="Maks. generasi paralel")
+    batch.add_argument("--seed", type=int, help="Seed pemilihan role/dimensi (hasil dapat direproduksi)")
+    add_model_arguments(batch)
+
+    serve = commands.add_parser("serve", help="Jalankan layanan HTTP (/analyze, /generate)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--max-sessions", type=int, default=10000, help="Maks. sesi aktif")
+    serve.add_argument("--session-ttl", type=float, default=3600, help="Detik sebelum sesi idle dibuang")
+    serve.add_argument("--seed", type=int, help="Seed dasar; tiap sesi mendapat stream sendiri")
+    add_model_arguments(serve)
+    return parser.parse_args(argv)
+
+def add_model_arguments(parser):
+    """Opsi backend model untuk mode non-interaktif"""
+    parser.add_argument("--model", default="echo",
+                        choices=["gemini", "openai", "transformers", "rest_api", "echo"])
+    parser.add_argument("--model-name")
+    parser.add_argument("--api-key", default=os.environ.get("MODEL_API_KEY"))
+    parser.add_argument("--api-url")
+    parser.add_argument("--device", type=int, default=-1)
+    parser.add_argument("--batch-size", type=int, default=1)
+
+def model_config_from_args(args):
+    model_config = {
+        "api_key": args.api_key,
+        "api_url": args.api_url,
+        "device": args.device,
+        "batch_size": args.batch_size
+    }
+    if args.model_name:
+        model_config["model_name"] = args.model_name
+    return model_config
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config(args.config)
+    EntropyCalculator.configure_lexicons(config)
+    if args.metrics or config.get("metrics"):
+        get_metrics().enable()
+
+    if args.command == "batch":
+        model_config = model_config_from_args(args)
+        if config.get("response_cache"):
+            model_config["cache"] = ResponseCache(**config["response_cache"])
+        model_generator = ModelGenerator.setup_generator(args.model, **model_config)
+        summary = run_batch(
+            args.in_path, args.out_path, config, model_generator,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            concurrency=args.concurrency,
+            seed=args.seed
+        )
+        if get_metrics().enabled:
+            summary['latency'] = get_metrics().snapshot()
+        print(json.dumps(summary), file=sys.stderr)
+        return
+
+    if args.command == "serve":
+        model_config = model_config_from_args(args)
+        if config.get("response_cache"):
+            model_config["cache"] = ResponseCache(**config["response_cache"])
+        # Generator async dibuat sekali per proses, dipakai bersama semua sesi
+        model_generator = ModelGenerator.setup_generator(args.model, async_mode=True, **model_config)
+        run_server(
+            config, model_generator,
+            host=args.host,
+            port=args.port,
+            max_sessions=args.max_sessions,
+            session_ttl=args.session_ttl,
+            seed=args.seed
+        )
+        return
+
+    interactive(config)
+
+def interactive(config):
     print_header()
 
     model_type = select_model_type()
     model_config = get_model_config(model_type)
 
+    # Cache respons (opsional), dikonfigurasi lewat "response_cache" di config.json
+    if config.get("response_cache"):
+        model_config["cache"] = ResponseCache(**config["response_cache"])
+
     try:
         model_generator = ModelGenerator.setup_generator(model_type, **model_config)
         print(f"✅ Model {model_type.upper()} berhasil diinisialisasi")
@@ -209,10 +615,19 @@ def main():
         print("🔄 Using fallback echo generator")
         model_generator = lambda prompt: f"ECHO: {prompt}"
 
+    # LTM persisten (opsional): dipakai bersama oleh semua request dan proses
+    memory = None
+    if config.get("memory_store"):
+        memory_store = MemoryStore(config["memory_store"])
+        memory = PFTCognitiveMemory(store=memory_store)
+        print(f"💾 Long-term memory: {config['memory_store']} ({len(memory_store)} pengalaman)")
+
     # =============================================
-    # 🔥 Inisialisasi PFT Fusion Controller
+    # 🔥 Pipeline terkompilasi (PFT Fusion Controller, selector, memori)
     # =============================================
-    pft_controller = EntropyCalculator.PFTFusion(
+    pipeline = Pipeline(
+        config, model_generator,
+        memory=memory,
         temperature=0.65,
         window_size=5
     )
@@ -232,59 +647,27 @@ def main():
 
             print("\n🔄 Menganalisis struktur dan ketidakpastian...")
 
-            # Hitung entropy dasar
-            entropy = EntropyCalculator.calculate_text_entropy(input_text)
-            normalized_entropy = EntropyCalculator.normalize_entropy(entropy)
-            entropy_level = EntropyCalculator.get_entropy_level(normalized_entropy)
-
-            # =============================================
-            # 🧠 ANALISIS KOMPLEKSITAS TINGKAT LANJUT
-            # =============================================
-            cognitive_depth = EntropyCalculator.estimate_cognitive_depth(input_text)
-            abstraction_level = EntropyCalculator.detect_abstraction_level(input_text)
-
-            # Update PFT controller dengan nilai kompleksitas
-            fusion_value = pft_controller.fuse(cognitive_depth, abstraction_level)
-
-            # Deteksi risiko reasoning collapse
-            collapse_risk = cognitive_depth > 0.7 and abstraction_level > 0.6
-
-            # Pilih role dan dimensi
-            selector = RoleSelector(config)
-            selected_role = selector.select_role(entropy_level)
-            cognitive_style, processing_style = selector.select_dimensions(entropy_level)
-
-            # =============================================
-            # 🚀 ADAPTIVE PROMPT ENGINEERING
-            # =============================================
-            # Tambahkan instruksi khusus berdasarkan analisis fusion
-            system_note = ""
-            if fusion_value > 0.4:
-                system_note = " [Gunakan pendekatan terstruktur dan solusi konkret]"
-            elif fusion_value < -0.4:
-                system_note = " [Eksplorasi berbagai perspektif dan kemungkinan solusi]"
-
-            if collapse_risk:
-                system_note += " ⚠️[HINDARI HALUSINASI - FAKTA SAJA]"
-
-            input_text += system_note
+            # Entropy, kompleksitas, fusion, risiko collapse, role dan dimensi
+            analysis = pipeline.analyze(input_text)
 
             # Print analysis (ditambah info baru)
             print("\n🔬 ANALISIS INPUT LANJUTAN:")
-            print(f"   Entropy: {entropy:.2f} ({entropy_level.upper()})")
-            print(f"   Kedalaman Kognitif: {cognitive_depth:.2f}")
-            print(f"   Level Abstraksi: {abstraction_level:.2f}")
-            print(f"   Nilai Fusion: {fusion_value:.2f}")
-            print(f"   Risiko Reasoning Collapse: {'YA' if collapse_risk else 'TIDAK'}")
-            print(f"   Role: {selected_role}")
-            print(f"   Gaya Kognitif: {cognitive_style}")
-            print(f"   Gaya Pemrosesan: {processing_style}")
+            print(f"   Entropy: {analysis['entropy']:.2f} ({analysis['entropy_level'].upper()})")
+            print(f"   Kedalaman Kognitif: {analysis['cognitive_depth']:.2f}")
+            print(f"   Level Abstraksi: {analysis['abstraction_level']:.2f}")
+            print(f"   Nilai Fusion: {analysis['fusion_value']:.2f}")
+            print(f"   Risiko Reasoning Collapse: {'YA' if analysis['collapse_risk'] else 'TIDAK'}")
+            print(f"   Role: {analysis['role']}")
+            print(f"   Gaya Kognitif: {analysis['cognitive_style']}")
+            print(f"   Gaya Pemrosesan: {analysis['processing_style']}")
 
             print("\n🤖 Membuat respons...")
 
-            # Hasilkan output seperti biasa
-            generator = OutputGenerator(selected_role, cognitive_style, processing_style)
-            output = generator.generate_output(input_text, model_generator)
+            # =============================================
+            # 🚀 ADAPTIVE PROMPT ENGINEERING
+            # =============================================
+            # Instruksi khusus berdasarkan analisis fusion ditambahkan oleh pipeline
+            output, output_uncertainty = pipeline.generate(input_text, analysis)
 
             print("\n💬 " + "="*50)
             print(output)
@@ -293,11 +676,14 @@ def main():
             # =============================================
             # 📈 POST-RESPONSE ANALYSIS
             # =============================================
-            # Hitung uncertainty dari output
-            output_uncertainty = EntropyCalculator.calculate_text_entropy(output)
+            # Entropy output sudah diakumulasi selama respons diterima
             print(f"\n📊 POST-ANALYSIS:")
             print(f"   Output Entropy: {output_uncertainty:.2f}")
-            print(f"   Meta-Entropy Window: {pft_controller.entropy_window[-3:]}")
+            print(f"   Meta-Entropy Window: {pipeline.pft_controller.entropy_window[-3:]}")
+            if get_metrics().enabled:
+                print("   Latensi per tahap (p50/p95 ms):")
+                for stage, latency in get_metrics().snapshot().items():
+                    print(f"     {stage}: {latency['p50'] * 1000:.2f} / {latency['p95'] * 1000:.2f}")
 
         except KeyboardInterrupt:
             print("\n\n👋 Program dihentikan. Sampai jumpa!")
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 import pathlib
 
 # Direktori saat ini
@@ -33,18 +33,25 @@ setup(
         "Operating System :: OS Independent",
     ],
     keywords="entropy utility decision-framework ai-agent",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    # Modul datar di akar repo (tanpa paket src/)
+    py_modules=[
+        "main", "BExecutor", "BRunner", "CEngine", "CPipeline", "DAnalyzer",
+        "ECalculator", "EProvider", "HMemory", "LMatcher", "LMetrics", "MProof",
+        "MStore", "OEngine", "OGenerator", "PVerifier", "RCache", "RSelector",
+        "RTrace", "SServer", "UAnalyszer", "examples"
+    ],
     include_package_data=True,
     install_requires=[
         "numpy",
         "scipy",
-        "spacy"
+        "spacy",
+        "aiohttp",
+        "requests"
     ],
     python_requires='>=3.7',
     entry_points={
         'console_scripts': [
-            'didactic-train = src.main:main',
+            'didactic-train = main:main',
         ],
     },
 )
\ No newline at end of file
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+
+try:
+    from aiohttp import web
+except ImportError:  # Dependensi generator async REST
+    web = None
+
+from main import ModelGenerator
+
+
+class StubServer:
+    """Server REST lokal yang mencatat jumlah request paralel tertinggi"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+
+    async def handle(self, request):
+        payload = await request.json()
+        self.requests += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return web.Response(text=f"OK: {payload['prompt']}")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/generate", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self.runner.addresses[0][:2]
+        return f"http://{host}:{port}/generate"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+@unittest.skipIf(web is None, "aiohttp tidak terpasang")
+class AsyncRestGeneratorTest(unittest.TestCase):
+    def make_generator(self, url, max_concurrency):
+        return ModelGenerator.setup_generator(
+            "rest_api", async_mode=True,
+            api_url=url,
+            max_concurrency=max_concurrency,
+            pool_size=32,
+            max_retries=0
+        )
+
+    def test_concurrency_limit(self):
+        async def scenario():
+            server = StubServer()
+            url = await server.start()
+            generator = self.make_generator(url, max_concurrency=3)
+            try:
+                responses = await asyncio.gather(*(generator(f"p{i}") for i in range(12)))
+            finally:
+                await generator.aclose()
+                await server.stop()
+            return server, responses
+
+        server, responses = asyncio.run(scenario())
+        self.assertEqual(responses, [f"OK: p{i}" for i in range(12)])
+        self.assertEqual(server.requests, 12)
+        self.assertEqual(server.peak, 3)
+
+    def test_closed_session_is_recreated(self):
+        async def scenario():
+            server = StubServer(delay=0)
+            url = await server.start()
+            generator = self.make_generator(url, max_concurrency=2)
+            try:
+                first = await generator("a")
+                await generator.aclose()
+                second = await generator("b")  # Session baru setelah aclose()
+            finally:
+                await generator.aclose()
+                await server.stop()
+            return first, second
+
+        self.assertEqual(asyncio.run(scenario()), ("OK: a", "OK: b"))
+
+
+class BoundedGeneratorTest(unittest.TestCase):
+    def test_reused_across_event_loops(self):
+        in_flight = peak = 0
+
+        async def slow(prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return prompt
+
+        generator = ModelGenerator.bounded(slow, 2)
+
+        async def scenario():
+            # Persaingan memaksa semaphore menunggu di loop ini
+            return await asyncio.gather(*(generator(f"p{i}") for i in range(6)))
+
+        # Semaphore terikat ke loop; loop kedua harus mendapat miliknya sendiri
+        first = asyncio.run(scenario())
+        second = asyncio.run(scenario())
+        self.assertEqual(first, second)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()